@@ -0,0 +1,108 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from clubs import club_cache
+from clubs import pairing
+from clubs.models import Tournament, Group, Participant, Grouping, TournamentMatch
+
+def can_advance(tournament):
+    """Checks if tournament can move on to its next phase."""
+    return (
+        tournament.is_active and
+        tournament.passed_deadline() and
+        not TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = True).exists()
+    )
+
+def eliminate_participants(tournament):
+    """Eliminate participants not qualifying from active groups of tournament, and close those groups."""
+    groupings = Grouping.objects.filter(group__tournament = tournament, group__is_active = True)
+    groupings = groupings.order_by('group_id', 'points_in_group', 'id').values_list('group_id', 'group__total_participants_limit', 'participant_id')
+    eliminated_participant_ids = []
+    qualified_per_group = {}
+
+    for group_id, total_participants_limit, participant_id in groupings:
+        qualified = qualified_per_group.get(group_id, 0)
+
+        if qualified < (2 if total_participants_limit >= 4 else 1):
+            qualified_per_group[group_id] = qualified + 1
+        else:
+            eliminated_participant_ids.append(participant_id)
+
+    Participant.objects.filter(id__in = eliminated_participant_ids).update(eliminated = True)
+    Group.objects.filter(tournament = tournament, is_active = True).update(is_active = False)
+
+def create_matches_for_groups(tournament, groups):
+    """Create round robin matches between groupings of each group."""
+    groupings_per_group = {group.id : [] for group in groups}
+
+    for grouping in Grouping.objects.filter(group__in = groups).order_by('group_id', 'id'):
+        groupings_per_group[grouping.group_id].append(grouping)
+
+    tournament_matches = []
+
+    for group in groups:
+        groupings = groupings_per_group[group.id]
+
+        if len(groupings) > group.total_participants_limit:
+            raise ValidationError('Can not create more groupings than group total participants limit.')
+
+        for counter1 in range(len(groupings) - 1):
+            for counter2 in range(counter1 + 1, len(groupings)):
+                tournament_matches.append(TournamentMatch(
+                    tournament = tournament,
+                    group = group,
+                    player1 = groupings[counter1],
+                    player2 = groupings[counter2]
+                ))
+
+    TournamentMatch.objects.bulk_create(tournament_matches)
+
+def end_tournament(tournament):
+    """Set remaining participant, if any, as winner and end tournament."""
+    Participant.objects.filter(tournament = tournament, eliminated = False).update(won = True, eliminated = True)
+    Tournament.objects.filter(id = tournament.id).update(is_active = False)
+    tournament.is_active = False
+
+def advance_tournament(tournament):
+    """
+    Move tournament on to its next phase, in one transaction, and return if it did.
+
+    Participants not qualifying from the current groups are eliminated, then
+    groups, groupings and matches of the next phase are created. When fewer
+    than two participants remain, the last one wins and the tournament ends.
+
+    Readiness is first checked without writing, so requests for tournaments
+    not ready, such as after every result, do not take the write lock. Then,
+    in the transaction, the phase is moved on, only when still at the phase
+    the tournament was read at, and readiness is checked again, so concurrent
+    or repeated requests for the same phase do nothing. Writing first in the
+    transaction makes concurrent requests wait for the write lock of
+    databases such as SQLite, rather than failing to upgrade a read to a write.
+    """
+
+    if not can_advance(tournament):
+        return False
+
+    with transaction.atomic():
+        if not Tournament.objects.filter(id = tournament.id, phase = tournament.phase).update(phase = F('phase') + 1):
+            return False
+
+        if not can_advance(Tournament.objects.get(id = tournament.id)):
+            transaction.set_rollback(True)
+            return False
+
+        tournament.phase += 1
+
+        eliminate_participants(tournament)
+        participant_ids = list(Participant.objects.filter(tournament = tournament, eliminated = False).order_by('id').values_list('id', flat = True))
+
+        if len(participant_ids) > 1:
+            groups = pairing.create_groups(tournament, participant_ids)
+            create_matches_for_groups(tournament, groups)
+        else:
+            end_tournament(tournament)
+
+        # Rows are changed by bulk inserts and updates, which do not send signals.
+        club_cache.invalidate_club(tournament.club_id)
+
+    return True
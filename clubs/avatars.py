@@ -0,0 +1,91 @@
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from django.conf import settings
+
+# Cells per side of identicon grid. Left half is mirrored onto right half.
+GRID_SIZE = 5
+
+# Bump when the drawing changes, so cached images and ETags of old drawings are not reused.
+IDENTICON_VERSION = 1
+
+BACKGROUND_COLOUR = (240, 240, 240)
+
+def identicon_colour(email_hash):
+    """Return foreground colour of identicon for email hash."""
+    red, green, blue = bytes.fromhex(email_hash[-6:])
+    # Keeps colour dark enough to stand out from background.
+    return (red // 2 + 32, green // 2 + 32, blue // 2 + 32)
+
+def identicon_cells(email_hash):
+    """Return grid of identicon cells for email hash, True where cell is filled."""
+    bits = int(email_hash[:8], 16)
+    half = (GRID_SIZE + 1) // 2
+    cells = [[False] * GRID_SIZE for row in range(GRID_SIZE)]
+
+    for row in range(GRID_SIZE):
+        for column in range(half):
+            filled = bool(bits & (1 << (row * half + column)))
+            cells[row][column] = filled
+            cells[row][GRID_SIZE - 1 - column] = filled
+
+    return cells
+
+def _png_chunk(chunk_type, data):
+    chunk = chunk_type + data
+    return struct.pack('>I', len(data)) + chunk + struct.pack('>I', zlib.crc32(chunk) & 0xffffffff)
+
+def render_identicon(email_hash, size):
+    """Return PNG image, of size by size pixels, of identicon for email hash."""
+    cells = identicon_cells(email_hash)
+    colour = bytes(identicon_colour(email_hash))
+    background = bytes(BACKGROUND_COLOUR)
+    # Leaves half a cell of margin around grid.
+    cell_size = size / (GRID_SIZE + 1)
+    margin = cell_size / 2
+    rows = []
+
+    for y in range(size):
+        row = bytearray(b'\x00')
+        cell_row = int((y - margin) // cell_size) if y >= margin else -1
+
+        for x in range(size):
+            cell_column = int((x - margin) // cell_size) if x >= margin else -1
+
+            if (0 <= cell_row < GRID_SIZE) and (0 <= cell_column < GRID_SIZE) and cells[cell_row][cell_column]:
+                row += colour
+            else:
+                row += background
+
+        rows.append(bytes(row))
+
+    header = struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n' +
+        _png_chunk(b'IHDR', header) +
+        _png_chunk(b'IDAT', zlib.compress(b''.join(rows), 9)) +
+        _png_chunk(b'IEND', b'')
+    )
+
+def avatar_etag(email_hash, size):
+    """Return strong ETag of avatar, which only depends on email hash, size and drawing version."""
+    return f'"{email_hash}-{size}-{IDENTICON_VERSION}"'
+
+def get_avatar_path(email_hash, size):
+    """Return path of cached avatar image for email hash and size, rendering it on first use."""
+    directory = Path(settings.AVATAR_CACHE_DIR) / f'v{IDENTICON_VERSION}' / str(size)
+    path = directory / f'{email_hash}.png'
+
+    if not path.exists():
+        directory.mkdir(parents = True, exist_ok = True)
+        # Written to a temporary file first, so concurrent requests never serve a partly written image.
+        file_descriptor, temporary_path = tempfile.mkstemp(dir = directory, suffix = '.tmp')
+
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            temporary_file.write(render_identicon(email_hash, size))
+
+        os.replace(temporary_path, path)
+
+    return path
@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+import hashlib
+import time
+
+# Seconds entries of a club stay cached. Entries are also left behind, unused, when the version of their club is bumped.
+CLUB_CACHE_TIMEOUT = 60 * 60
+
+def club_version_key(club_id):
+    """Return cache key of version of cached entries of club."""
+    return f'club_version:{club_id}'
+
+def _new_version():
+    # Versions start from the time in microseconds, so a version key evicted from the cache never brings back entries of an earlier version.
+    return time.time_ns() // 1000
+
+def get_club_version(club_id):
+    """Return version of cached entries of club."""
+    key = club_version_key(club_id)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+
+    return version
+
+def _bump_club_version(club_id):
+    key = club_version_key(club_id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _new_version(), None)
+
+def invalidate_club(club_id):
+    """
+    Make every cached entry of club stale, by bumping version of club. When
+    called in a transaction, the version is bumped again on commit, so entries
+    cached from data read before commit are not used either.
+    """
+
+    _bump_club_version(club_id)
+
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump_club_version(club_id))
+
+def club_cache_key(club_id, *parts):
+    """Return cache key of entry of club, identified by parts, for current version of club."""
+    # Parts are hashed, as the cache tag does, so keys stay short and free of spaces, which memcached rejects.
+    parts_hash = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'club:{club_id}:{get_club_version(club_id)}:{parts_hash}'
+
+def get_or_set_club_entry(club_id, parts, compute):
+    """Return cached entry of club identified by parts, or compute, cache and return it."""
+    key = club_cache_key(club_id, *parts)
+    value = cache.get(key)
+
+    if value is None:
+        value = compute()
+        cache.set(key, value, CLUB_CACHE_TIMEOUT)
+
+    return value
+
+def fragment_context(club_id, viewer_role):
+    """Return context keying template fragments of club, cached with the cache tag, by version of club and role of viewer."""
+    return {'club_cache_timeout' : CLUB_CACHE_TIMEOUT, 'club_cache_version' : get_club_version(club_id), 'viewer_role' : viewer_role}
@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from clubs.models import Membership
+
+# Seconds the navbar membership list of a user stays cached. Entries are also dropped by signals on change.
+CLUB_MEMBERSHIPS_CACHE_TIMEOUT = 60 * 60
+
+def club_memberships_cache_key(user_id):
+    """Return cache key of the navbar membership list of user."""
+    return f'club_memberships:{user_id}'
+
+def get_club_memberships(user_id):
+    """Return list of (club id, club name, member type) tuples of memberships of user."""
+    key = club_memberships_cache_key(user_id)
+    club_memberships = cache.get(key)
+
+    if club_memberships is None:
+        club_memberships = list(
+            Membership.objects.filter(member_id = user_id).order_by('id').values_list('club_id', 'club__name', 'member_type')
+        )
+        cache.set(key, club_memberships, CLUB_MEMBERSHIPS_CACHE_TIMEOUT)
+
+    return club_memberships
+
+def invalidate_club_memberships(user_ids):
+    """Drop cached navbar membership lists of users."""
+    cache.delete_many([club_memberships_cache_key(user_id) for user_id in user_ids])
+
+def memberships(request):
+    """Add memberships of logged in user, used by the navbar, to the context."""
+    if request.user.is_authenticated:
+        return {'memberships' : get_club_memberships(request.user.id)}
+    else:
+        return {}
@@ -0,0 +1,19 @@
+from django.conf import settings
+
+# Pragmas writing to the database file, which read only replicas, such as file:...?mode=ro URIs, cannot be opened with.
+WRITE_PRAGMAS = ('journal_mode', 'synchronous')
+
+def apply_pragmas(sqlite_connection, pragmas):
+    """Set pragmas, by name, on SQLite connection."""
+    for name, value in pragmas.items():
+        sqlite_connection.execute(f'PRAGMA {name} = {value}')
+
+def configure_connection(connection):
+    """Set settings.SQLITE_PRAGMAS on new connection of Django, if to a SQLite database, leaving out write pragmas on replicas."""
+    if (connection.vendor == 'sqlite') and settings.SQLITE_PRAGMAS:
+        pragmas = settings.SQLITE_PRAGMAS
+
+        if connection.alias in settings.DATABASE_REPLICAS:
+            pragmas = {name : value for name, value in pragmas.items() if name not in WRITE_PRAGMAS}
+
+        apply_pragmas(connection.connection, pragmas)
@@ -1,8 +1,12 @@
+from collections import defaultdict
 from django.utils import timezone
 from django import forms
 from django.core.validators import RegexValidator
-from clubs.models import User, Club, Membership, Tournament, TournamentMatch
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from clubs.models import User, Club, Membership, Tournament, Grouping, TournamentMatch
 from django.contrib.auth import authenticate
+import re
 
 class LogInForm(forms.Form):
     """Form enabling registered users to log in."""
@@ -201,28 +205,104 @@ class SetTournamentMatchForm(forms.ModelForm):
         fields = ['conclusion',]
 
     def save(self):
-        """Save tournament match."""
+        """
+        Save tournament match, and add points to both players, in one transaction.
+
+        The match is only set if it is still not concluded, so concurrent
+        results can not score it twice. Returns None when it was concluded
+        meanwhile.
+        """
 
         super().save(commit = False)
         conclusion = self.cleaned_data.get('conclusion')
         tournament_match = self.instance
 
-        if (conclusion == TournamentMatch.ConclusionTypes.DRAW):
-            player1_addition = 0.5
-            player2_addition = 0.5
-        elif (conclusion == TournamentMatch.ConclusionTypes.PLAYER_1_WINS):
-            player1_addition = 1
-            player2_addition = 0
-        else:
-            player1_addition = 0
-            player2_addition = 1
-
-        player1 = tournament_match.player1
-        player2 = tournament_match.player2
-        player1.points_in_group = tournament_match.player1.points_in_group + player1_addition
-        player2.points_in_group = tournament_match.player2.points_in_group + player2_addition
-        player1.save()
-        player2.save()
+        player1_addition, player2_addition = TournamentMatch.conclusion_points(conclusion)
+
+        with transaction.atomic():
+            if not TournamentMatch.objects.filter(id = tournament_match.id, conclusion__isnull = True).update(conclusion = conclusion):
+                return None
+
+            Grouping.objects.filter(id = tournament_match.player1_id).update(points_in_group = F('points_in_group') + player1_addition)
+            Grouping.objects.filter(id = tournament_match.player2_id).update(points_in_group = F('points_in_group') + player2_addition)
+
         tournament_match.conclusion = conclusion
-        tournament_match.save()
         return tournament_match
+
+class SetTournamentMatchesForm(forms.Form):
+    """Enables setting of end of many tournament matches at once."""
+
+    def __init__(self, *args, **kwargs):
+        self.tournament_matches = kwargs.pop('tournament_matches')
+        super().__init__(*args, **kwargs)
+
+        for tournament_match in self.tournament_matches:
+            self.fields[self.field_name(tournament_match)] = forms.TypedChoiceField(
+                choices = [('', '---------')] + TournamentMatch.ConclusionTypes.choices,
+                coerce = int,
+                empty_value = None,
+                required = False,
+                label = (
+                    f'{tournament_match.group.type_label()} {tournament_match.group.number or ""}: '
+                    f'{tournament_match.player1.participant.member.member_full_name()} vs '
+                    f'{tournament_match.player2.participant.member.member_full_name()}'
+                )
+            )
+
+    @staticmethod
+    def field_name(tournament_match):
+        """Return name of conclusion field of tournament match."""
+        return f'tournament_match_{tournament_match.id}'
+
+    @staticmethod
+    def posted_tournament_match_ids(data):
+        """Return ids of tournament matches with conclusion fields in posted data."""
+        return [int(name[len('tournament_match_'):]) for name in data if re.fullmatch(r'tournament_match_\d+', name)]
+
+    def save(self):
+        """
+        Save all tournament matches given a conclusion, and add points to their
+        players, in one transaction.
+
+        Matches are only set if none of them was concluded meanwhile. Returns
+        number of matches set, or None when some were concluded meanwhile.
+        """
+
+        conclusions = {}
+
+        for tournament_match in self.tournament_matches:
+            conclusion = self.cleaned_data.get(self.field_name(tournament_match))
+
+            if conclusion is not None:
+                conclusions[tournament_match] = conclusion
+
+        if not conclusions:
+            return 0
+
+        points = defaultdict(float)
+
+        for tournament_match, conclusion in conclusions.items():
+            player1_addition, player2_addition = TournamentMatch.conclusion_points(conclusion)
+            points[tournament_match.player1_id] += player1_addition
+            points[tournament_match.player2_id] += player2_addition
+
+        with transaction.atomic():
+            updated = TournamentMatch.objects.filter(id__in = [tournament_match.id for tournament_match in conclusions], conclusion__isnull = True).update(
+                conclusion = Case(*[When(id = tournament_match.id, then = Value(conclusion)) for tournament_match, conclusion in conclusions.items()])
+            )
+
+            if updated != len(conclusions):
+                transaction.set_rollback(True)
+                return None
+
+            Grouping.objects.filter(id__in = points.keys()).update(
+                points_in_group = F('points_in_group') + Case(
+                    *[When(id = grouping_id, then = Value(addition)) for grouping_id, addition in points.items()],
+                    output_field = FloatField()
+                )
+            )
+
+        for tournament_match, conclusion in conclusions.items():
+            tournament_match.conclusion = conclusion
+
+        return len(conclusions)
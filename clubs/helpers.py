@@ -1,8 +1,12 @@
+from django.core import signing
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, F, Q
 from django.urls import reverse
 from django.shortcuts import redirect
 from django.conf import settings
-from clubs.models import User, Club, Membership, Tournament, Group, Participant, Grouping, TournamentMatch
+from clubs.models import Membership, Tournament, Participant, TournamentMatch
 
 def view_login_prohibited(function):
     def wrapper(request):
@@ -14,21 +18,25 @@ def view_login_prohibited(function):
     return wrapper
 
 def membership_check(request, club_id):
+    """Resolve club and membership of the viewer, and attach them to request."""
     try:
-        club = Club.objects.get(id = club_id)
-        membership = Membership.objects.get(club = club, member = request.user)
+        membership = Membership.objects.select_related('club').get(club_id = club_id, member = request.user)
     except ObjectDoesNotExist:
         return False
     else:
+        request.club = membership.club
+        request.membership = membership
         return True
 
-def club_and_tournament_check(club_id, tournament_id):
+def club_and_tournament_check(request, tournament_id):
+    """Resolve tournament of the club already on request, and attach it to request."""
     try:
-        club = Club.objects.get(id = club_id)
-        tournament = Tournament.objects.get(id = tournament_id, club = club)
+        tournament = Tournament.objects.select_related('organiser').get(id = tournament_id, club = request.club)
     except ObjectDoesNotExist:
         return False
     else:
+        tournament.club = request.club
+        request.tournament = tournament
         return True
 
 def view_club_requirements(function):
@@ -43,12 +51,12 @@ def view_user_and_club_requirements(function):
     def wrapper(request, user_id, club_id):
         if membership_check(request, club_id):
             try:
-                club = Club.objects.get(id = club_id)
-                user = User.objects.get(id = user_id)
-                member_membership = Membership.objects.get(club = club, member = user)
+                member_membership = Membership.objects.select_related('member').get(club = request.club, member_id = user_id)
             except ObjectDoesNotExist:
                 return redirect(reverse('member_list', kwargs = {'club_id' : club_id}))
             else:
+                member_membership.club = request.club
+                request.member_membership = member_membership
                 return function(request, user_id, club_id)
         else:
             return redirect('user_page')
@@ -58,7 +66,7 @@ def view_user_and_club_requirements(function):
 def view_tournament_requirements(function):
     def wrapper(request, club_id, tournament_id):
         if membership_check(request, club_id):
-            if club_and_tournament_check(club_id, tournament_id):
+            if club_and_tournament_check(request, tournament_id):
                 return function(request, club_id, tournament_id)
             else:
                 return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
@@ -70,13 +78,14 @@ def view_tournament_requirements(function):
 def view_membership_and_tournament_requirements(function):
     def wrapper(request, club_id, membership_id, tournament_id):
         if membership_check(request, club_id):
-            if club_and_tournament_check(club_id, tournament_id):
+            if club_and_tournament_check(request, tournament_id):
                 try:
-                    club = Club.objects.get(id = club_id)
-                    member_membership = Membership.objects.get(id = membership_id, club = club)
+                    member_membership = Membership.objects.get(id = membership_id, club = request.club)
                 except ObjectDoesNotExist:
                     return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' :tournament_id}))
                 else:
+                    member_membership.club = request.club
+                    request.member_membership = member_membership
                     return function(request, club_id, membership_id, tournament_id)
             else:
                 return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
@@ -88,13 +97,14 @@ def view_membership_and_tournament_requirements(function):
 def view_tournament_match_and_tournament_requirements(function):
     def wrapper(request, club_id, tournament_id, tournament_match_id):
         if membership_check(request, club_id):
-            if club_and_tournament_check(club_id, tournament_id):
+            if club_and_tournament_check(request, tournament_id):
                 try:
-                    tournament = Tournament.objects.get(id = tournament_id)
-                    tournament_match = TournamentMatch.objects.get(id = tournament_match_id, tournament = tournament)
+                    tournament_match = TournamentMatch.objects.get(id = tournament_match_id, tournament = request.tournament)
                 except ObjectDoesNotExist:
                     return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
                 else:
+                    tournament_match.tournament = request.tournament
+                    request.tournament_match = tournament_match
                     return function(request, club_id, tournament_id, tournament_match_id)
             else:
                 return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
@@ -103,6 +113,62 @@ def view_tournament_match_and_tournament_requirements(function):
 
     return wrapper
 
+def club_and_owner_membership(club):
+    """Return membership of owner of club, with club and total members of club."""
+    club_and_owner_membership = Membership.objects.select_related('club', 'member').annotate(club_total_members = Count('club__membership'))
+    return club_and_owner_membership.get(club = club, member_type = Membership.MemberTypes.CLUB_OWNER)
+
+def club_winners(club):
+    """Return participants who won ended tournaments of club."""
+    return Participant.objects.filter(tournament__club = club, tournament__is_active = False, won = True)
+
+def club_winners_page_number(winner_count, page_number):
+    """Return number of page of winners shown for requested page number, which may be missing, invalid or out of range."""
+    return Paginator(range(winner_count), settings.WINNERS_PER_PAGE).get_page(page_number).number
+
+def club_winners_page(club, page_number, winner_count):
+    """Return page of participants who won ended tournaments of club, of winner count in total, latest first, loaded so it can be cached."""
+    winners = club_winners(club).select_related('tournament', 'member').order_by('-tournament__deadline', '-tournament_id')
+    paginator = Paginator(winners, settings.WINNERS_PER_PAGE)
+    paginator.count = winner_count
+    page = paginator.get_page(page_number)
+    page.object_list = list(page.object_list)
+    # Total is counted already, so queryset of every winner is dropped, as pickling would load it.
+    page.paginator.object_list = []
+    return page
+
+def member_list_memberships(membership):
+    """Return memberships of club of membership that membership can see, loading only fields shown in member list."""
+    if (membership.is_member()):
+        membership_list = Membership.objects.filter(club = membership.club, member__is_admin = False, member_type = Membership.MemberTypes.MEMBER)
+    else:
+        membership_list = Membership.objects.filter(club = membership.club, member__is_admin = False)
+
+    return membership_list.select_related('member').only(
+        'id', 'club_id', 'member_first_name', 'member_last_name', 'member_bio', 'member__id', 'member__email', 'member__email_hash'
+    )
+
+def join_tournament(tournament, membership):
+    """
+    Add membership as participant of tournament, and return participant, or
+    None if tournament is full.
+
+    A seat is reserved first, by counting the participant in only while the
+    tournament is below its limit, so concurrent joins can not go over it.
+    """
+
+    with transaction.atomic():
+        if not Tournament.objects.filter(id = tournament.id, participant_count__lt = F('total_participants_limit')).update(participant_count = F('participant_count') + 1):
+            return None
+
+        participant = Participant(tournament = tournament, member = membership)
+        # Counted in already, so not counted again when saved.
+        participant.seat_reserved = True
+        participant.save()
+
+    tournament.participant_count += 1
+    return participant
+
 def check_membership_in_tournament(membership, tournament):
     try:
         participant = Participant.objects.get(tournament = tournament, member = membership)
@@ -111,32 +177,58 @@ def check_membership_in_tournament(membership, tournament):
     else:
         return True
 
-def create_groupings_for_group(tournament, group, participants):
-    participant = participants[0]
-    participants = participants.exclude(id = participant.id)
-    matches_participated_limit = 0
-    counter1 = 0
+def keyset_filter(ordering, values, lookup):
+    """Return filter of rows after, with lookup 'gt', or before, with lookup 'lt', values of ordering fields."""
+    keyset_q = Q()
 
-    while (counter1 < (group.total_participants_limit - 1)):
-        counter2 = 0
-        found = False
+    for counter, field in enumerate(ordering):
+        condition = Q(**{f'{field}__{lookup}' : values[counter]})
 
-        while (found == False):
-            tournament_matches = TournamentMatch.objects.filter(conclusion__isnull = False, tournament = tournament, player1__participant = participant, player2__participant = participants[counter2])
-            tournament_matches = tournament_matches.union(TournamentMatch.objects.filter(conclusion__isnull = False, tournament = tournament, player1__participant = participants[counter2], player2__participant = participant))
+        for previous_field, previous_value in zip(ordering[:counter], values[:counter]):
+            condition &= Q(**{previous_field : previous_value})
 
-            if (tournament_matches.count() == matches_participated_limit):
-                found = True
-                Grouping.objects.create(group = group, participant = participants[counter2])
-                participants = participants.exclude(id = participants[counter2].id)
-            else:
-                if (counter2 == (participants.count() - 1)):
-                    counter2 = 0
-                    matches_participated_limit = matches_participated_limit + 1
-                else:
-                    counter2 = counter2 + 1
+        keyset_q |= condition
+
+    return keyset_q
+
+def decode_cursor(cursor):
+    """Return values of ordering fields in cursor, or None if cursor is missing or invalid."""
+    if not cursor:
+        return None
+
+    try:
+        return signing.loads(cursor, salt = 'keyset_cursor')
+    except signing.BadSignature:
+        return None
+
+def get_keyset_page(queryset, ordering, page_size, after = None, before = None):
+    """
+    Return rows of queryset, in ordering, after or before values of ordering
+    fields of given decoded cursor, with cursors of next and previous pages,
+    or None where there is no such page.
+
+    Rows are found with a filter on the ordering fields rather than an offset,
+    so every page takes the same time however deep it is. The last ordering
+    field must be unique.
+    """
+
+    if before is not None:
+        rows = list(queryset.filter(keyset_filter(ordering, before, 'lt')).order_by(*[f'-{field}' for field in ordering])[:page_size + 1])
+        has_previous = len(rows) > page_size
+        has_next = True
+        rows = rows[:page_size][::-1]
+    else:
+        if after is not None:
+            queryset = queryset.filter(keyset_filter(ordering, after, 'gt'))
+
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_previous = after is not None
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
 
-        counter1 = counter1 + 1
+    def cursor(row):
+        return signing.dumps([getattr(row, field) for field in ordering], salt = 'keyset_cursor')
 
-    Grouping.objects.create(group = group, participant = participant)
-    return participants
+    next_cursor = cursor(rows[-1]) if (rows and has_next) else None
+    previous_cursor = cursor(rows[0]) if (rows and has_previous) else None
+    return (rows, next_cursor, previous_cursor)
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+import json
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from clubs.database import apply_pragmas
+
+class Command(BaseCommand):
+    """
+    The SQLite profile benchmark.
+
+    Runs concurrent readers, listing members of a club as the member list
+    does, and writers, adding and editing members, against a scratch SQLite
+    database, first as the default profile does, connecting for each request
+    with default pragmas, then as the sqlite_production profile does, with
+    persistent connections and settings.SQLITE_PRODUCTION_PRAGMAS. Reports
+    throughput of each as JSON.
+    """
+
+    help = 'Compares concurrent read and write throughput of SQLite with default and production database profiles.'
+
+    CLUB_COUNT = 50
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type = float, default = 5, help = 'Duration of run of each profile.')
+        parser.add_argument('--readers', type = int, default = 4, help = 'Threads reading.')
+        parser.add_argument('--writers', type = int, default = 2, help = 'Threads writing.')
+        parser.add_argument('--rows', type = int, default = 20000, help = 'Members in scratch database.')
+
+    def handle(self, *args, **options):
+        if (options['readers'] < 0) or (options['writers'] < 0) or not (options['readers'] + options['writers']):
+            raise CommandError('--readers and --writers must not be negative, and not both 0.')
+
+        report = {'seconds' : options['seconds'], 'readers' : options['readers'], 'writers' : options['writers'], 'rows' : options['rows']}
+
+        for profile, persistent, pragmas in (('default', False, {}), ('sqlite_production', True, settings.SQLITE_PRODUCTION_PRAGMAS)):
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / 'benchmark.sqlite3'
+                self.create_database(path, options['rows'])
+                report[profile] = self.run_profile(path, persistent, pragmas, options)
+
+        report['speedup'] = {
+            name : round(report['sqlite_production'][name] / report['default'][name], 2) if report['default'][name] else None
+            for name in ('reads_per_second', 'writes_per_second')
+        }
+        self.stdout.write(json.dumps(report, indent = 2))
+
+    def create_database(self, path, rows):
+        sqlite_connection = sqlite3.connect(path)
+        sqlite_connection.execute('CREATE TABLE member (id INTEGER PRIMARY KEY, club_id INTEGER, first_name TEXT, last_name TEXT, bio TEXT)')
+        sqlite_connection.execute('CREATE INDEX member_club_name_idx ON member (club_id, first_name, last_name, id)')
+        rng = random.Random(0)
+        sqlite_connection.executemany(
+            'INSERT INTO member (club_id, first_name, last_name, bio) VALUES (?, ?, ?, ?)',
+            ((rng.randrange(Command.CLUB_COUNT), f'first{rng.randrange(rows)}', f'last{counter}', 'bio ' * 50) for counter in range(rows))
+        )
+        sqlite_connection.commit()
+        sqlite_connection.close()
+
+    def run_profile(self, path, persistent, pragmas, options):
+        """Run readers and writers for seconds, and return their throughput."""
+        counts = {'reads' : 0, 'writes' : 0, 'errors' : 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['seconds']
+
+        def connect():
+            # Python waits up to 5 seconds on locked databases by default, as Django does.
+            sqlite_connection = sqlite3.connect(path, isolation_level = None, check_same_thread = False)
+            apply_pragmas(sqlite_connection, pragmas)
+            return sqlite_connection
+
+        def read(sqlite_connection, rng):
+            sqlite_connection.execute(
+                'SELECT id, first_name, last_name, bio FROM member WHERE club_id = ? ORDER BY first_name, last_name, id LIMIT 50',
+                [rng.randrange(Command.CLUB_COUNT)]
+            ).fetchall()
+
+        def write(sqlite_connection, rng):
+            sqlite_connection.execute('BEGIN IMMEDIATE')
+            sqlite_connection.execute(
+                'INSERT INTO member (club_id, first_name, last_name, bio) VALUES (?, ?, ?, ?)',
+                [rng.randrange(Command.CLUB_COUNT), 'first', 'last', 'bio']
+            )
+            sqlite_connection.execute('UPDATE member SET bio = ? WHERE id = ?', ['edited', rng.randrange(1, options['rows'])])
+            sqlite_connection.execute('COMMIT')
+
+        def work(operation, count_name, seed):
+            rng = random.Random(seed)
+            sqlite_connection = connect() if persistent else None
+            count = 0
+            errors = 0
+
+            while time.perf_counter() < deadline:
+                # Without persistent connections, each request connects anew.
+                request_connection = sqlite_connection or connect()
+
+                try:
+                    operation(request_connection, rng)
+                    count += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+
+                    if request_connection.in_transaction:
+                        request_connection.execute('ROLLBACK')
+                finally:
+                    if not persistent:
+                        request_connection.close()
+
+            if sqlite_connection:
+                sqlite_connection.close()
+
+            with lock:
+                counts[count_name] += count
+                counts['errors'] += errors
+
+        threads = [threading.Thread(target = work, args = (read, 'reads', counter)) for counter in range(options['readers'])]
+        threads += [threading.Thread(target = work, args = (write, 'writes', -counter - 1)) for counter in range(options['writers'])]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return {
+            'reads_per_second' : round(counts['reads'] / options['seconds'], 1),
+            'writes_per_second' : round(counts['writes'] / options['seconds'], 1),
+            'locked_errors' : counts['errors']
+        }
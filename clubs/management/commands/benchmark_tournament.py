@@ -0,0 +1,221 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+import django
+import json
+import random
+import subprocess
+import time
+import tracemalloc
+import uuid
+from clubs.models import User, Club, Membership, Tournament, TournamentMatch
+
+class PhaseMeasurement:
+    """Wall time, query count and peak memory of requests of a phase of a tournament."""
+
+    def __init__(self, name, trace_memory = True):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.requests = 0
+        self.wall_time = 0
+        self.queries = 0
+        self.peak_memory = 0
+
+    @contextmanager
+    def measure(self):
+        """Add wall time, queries and peak memory of block to phase."""
+        # Logged queries are capped, so are cleared for each block to be counted in full.
+        reset_queries()
+
+        if self.trace_memory:
+            tracemalloc.start()
+
+        queries = CaptureQueriesContext(connection)
+        start = time.perf_counter()
+
+        try:
+            with queries:
+                yield
+        finally:
+            self.wall_time += time.perf_counter() - start
+
+            if self.trace_memory:
+                self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+        self.requests += 1
+        self.queries += len(queries.captured_queries)
+
+    def as_dict(self):
+        return {
+            'phase' : self.name,
+            'requests' : self.requests,
+            'wall_time_seconds' : round(self.wall_time, 6),
+            'queries' : self.queries,
+            'peak_memory_bytes' : self.peak_memory if self.trace_memory else None
+        }
+
+class Command(BaseCommand):
+    """
+    The tournament benchmark.
+
+    Creates a club with members, and plays a tournament of the greatest total
+    participants limit to a winner through the views, as members and the
+    organiser would, with random results. Wall time, query count and peak
+    memory of requests are reported per phase, as JSON to compare across
+    commits.
+    """
+
+    help = 'Plays a tournament to a winner through the views, and reports its cost per phase as JSON.'
+
+    PASSWORD = "Password123"
+    TOTAL_PARTICIPANTS_LIMIT = 96
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type = int, default = Command.TOTAL_PARTICIPANTS_LIMIT, help = 'Members of club, all joining the tournament up to its limit.')
+        parser.add_argument('--seed', type = int, default = 0, help = 'Seed of random match results.')
+        parser.add_argument('--output', default = None, help = 'File to write JSON report to, instead of standard output.')
+        parser.add_argument('--no-trace-memory', action = 'store_true', help = 'Do not trace peak memory, which slows requests down several times.')
+        parser.add_argument('--keep', action = 'store_true', help = 'Keep the club, users and tournament created.')
+
+    def handle(self, *args, **options):
+        if options['members'] < 2:
+            raise CommandError('--members must be at least 2.')
+
+        self.random = random.Random(options['seed'])
+        self.trace_memory = not options['no_trace_memory']
+        self.phases = []
+        token = uuid.uuid4().hex[:12]
+
+        # Requests of the test client are made to host testserver.
+        with override_settings(ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']):
+            try:
+                self.set_up(token, options['members'])
+                self.join_tournament()
+                self.play_tournament()
+            finally:
+                if not options['keep']:
+                    self.tear_down(token)
+
+        report = {
+            'commit' : self._commit(),
+            'django' : django.get_version(),
+            'database' : connection.vendor,
+            'members' : options['members'],
+            'participants' : self.tournament.participant_count,
+            'seed' : options['seed'],
+            'phases' : [phase.as_dict() for phase in self.phases],
+            'total' : {
+                'requests' : sum(phase.requests for phase in self.phases),
+                'wall_time_seconds' : round(sum(phase.wall_time for phase in self.phases), 6),
+                'queries' : sum(phase.queries for phase in self.phases),
+                'peak_memory_bytes' : max(phase.peak_memory for phase in self.phases) if self.trace_memory else None
+            }
+        }
+        report_json = json.dumps(report, indent = 2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report_json + '\n')
+        else:
+            self.stdout.write(report_json)
+
+    def _commit(self):
+        """Return commit being benchmarked, if known."""
+        try:
+            return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output = True, text = True, cwd = settings.BASE_DIR).stdout.strip() or None
+        except OSError:
+            return None
+
+    def _phase(self, name):
+        phase = PhaseMeasurement(name, self.trace_memory)
+        self.phases.append(phase)
+        return phase
+
+    def _client(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def set_up(self, token, member_count):
+        """Create club, with owner organising tournament, and members."""
+        self.club = Club.objects.create(name = f'Benchmark {token}', location = 'Benchmark', description = 'Benchmark club.')
+        password = make_password(Command.PASSWORD)
+        User.objects.bulk_create([
+            User(email = f'benchmark.{token}.{counter}@example.org', email_hash = User.hash_email(f'benchmark.{token}.{counter}@example.org'), password = password)
+            for counter in range(member_count + 1)
+        ])
+        users = list(User.objects.filter(email__startswith = f'benchmark.{token}.').order_by('id'))
+        Membership.objects.bulk_create([
+            Membership(
+                club = self.club,
+                member = user,
+                member_first_name = 'Benchmark',
+                member_last_name = str(counter),
+                member_contact_details = '0712345678',
+                member_chess_experience_level = Membership.MemberChessExperienceLevels.BEGINNER,
+                member_type = Membership.MemberTypes.CLUB_OWNER if counter == 0 else Membership.MemberTypes.MEMBER
+            )
+            for counter, user in enumerate(users)
+        ])
+        self.organiser, *self.members = users
+        self.tournament = Tournament.objects.create(
+            club = self.club,
+            organiser = Membership.objects.get(club = self.club, member = self.organiser),
+            name = 'Benchmark tournament',
+            description = 'Benchmark tournament.',
+            deadline = timezone.now() + timedelta(days = 1),
+            total_participants_limit = Command.TOTAL_PARTICIPANTS_LIMIT
+        )
+
+    def join_tournament(self):
+        """Have members join tournament, until it is full, then pass its deadline."""
+        phase = self._phase('join')
+        url = reverse('participate_in_tournament', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+
+        for user in self.members[:Command.TOTAL_PARTICIPANTS_LIMIT]:
+            client = self._client(user)
+
+            with phase.measure():
+                client.post(url)
+
+        Tournament.objects.filter(id = self.tournament.id).update(deadline = timezone.now() - timedelta(seconds = 1))
+        self.tournament.refresh_from_db()
+
+    def play_tournament(self):
+        """Have organiser create matches and set random results of each phase, until tournament has a winner."""
+        client = self._client(self.organiser)
+        phase = self._phase('create_matches')
+
+        with phase.measure():
+            client.get(reverse('create_matches', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id}), follow = True)
+
+        self.tournament.refresh_from_db()
+
+        while self.tournament.is_active:
+            tournament_match_ids = list(TournamentMatch.objects.filter(tournament = self.tournament, conclusion__isnull = True).order_by('id').values_list('id', flat = True))
+
+            if not tournament_match_ids:
+                raise CommandError(f'Tournament could not move on from phase {self.tournament.phase}.')
+
+            phase = self._phase(f'phase_{self.tournament.phase}')
+
+            # The last result of a phase moves the tournament on, through the redirect to create matches.
+            for tournament_match_id in tournament_match_ids:
+                url = reverse('set_tournament_match', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id, 'tournament_match_id' : tournament_match_id})
+
+                with phase.measure():
+                    client.post(url, {'conclusion' : self.random.choice(TournamentMatch.ConclusionTypes.values)}, follow = True)
+
+            self.tournament.refresh_from_db()
+
+    def tear_down(self, token):
+        Club.objects.filter(name = f'Benchmark {token}').delete()
+        User.objects.filter(email__startswith = f'benchmark.{token}.').delete()
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+import re
+from clubs import helpers
+from clubs.models import User, Club, Membership, Tournament, Group, Participant, TournamentMatch
+
+# Lines of query plans reading whole tables, on SQLite and PostgreSQL. Scans of SQLite using an index are not full table scans.
+FULL_SCAN_PATTERNS = (
+    re.compile(r'\bSCAN (TABLE )?\w+(?!.*\bUSING\b.*\bINDEX\b)'),
+    re.compile(r'\bSeq Scan on \w+'),
+)
+
+def is_full_scan(plan_line):
+    """Checks if line of query plan reads a whole table."""
+    return any(pattern.search(plan_line) for pattern in FULL_SCAN_PATTERNS)
+
+def hot_queries():
+    """Return list of (name, queryset) of hot queries of views, for rows in database or made up ids when there are none."""
+    membership = Membership.objects.select_related('club').filter(member_type = Membership.MemberTypes.MEMBER).first()
+    membership = membership or Membership(id = 0, club = Club(id = 0), member = User(id = 0), member_type = Membership.MemberTypes.MEMBER)
+    tournament_id = Tournament.objects.values_list('id', flat = True).first() or 0
+    group_id = Group.objects.values_list('id', flat = True).first() or 0
+    club_id = membership.club_id
+
+    return [
+        ('membership of user to club', Membership.objects.filter(club_id = club_id, member_id = membership.member_id)),
+        ('navbar memberships', Membership.objects.filter(member_id = membership.member_id).order_by('id').values_list('club_id', 'club__name', 'member_type')),
+        ('member list', helpers.member_list_memberships(membership).order_by('member_first_name', 'member_last_name', 'id')),
+        ('officers of club', Membership.objects.filter(club_id = club_id, member_type = Membership.MemberTypes.OFFICER)),
+        ('winners of club', Participant.objects.filter(tournament__club_id = club_id, tournament__is_active = False, won = True)),
+        ('joinable tournaments', Tournament.objects.filter(club_id = club_id, is_active = True, deadline__gte = timezone.now())),
+        ('active groups of tournament', Group.objects.filter(tournament_id = tournament_id, is_active = True)),
+        ('remaining participants of tournament', Participant.objects.filter(tournament_id = tournament_id, eliminated = False)),
+        ('open matches of tournament', TournamentMatch.objects.filter(tournament_id = tournament_id, conclusion__isnull = True)),
+        ('open matches of group', TournamentMatch.objects.filter(group_id = group_id, conclusion__isnull = True)),
+    ]
+
+class Command(BaseCommand):
+    """Explains hot queries of views, flagging full table scans."""
+
+    help = 'Runs EXPLAIN on hot queries of views and flags full table scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action = 'store_true', help = 'Gather statistics of tables first, which query planners choose indexes by.')
+        parser.add_argument('--fail-on-scan', action = 'store_true', help = 'Exit with an error if any query scans a whole table.')
+
+    def handle(self, *args, **options):
+        flagged = []
+
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        for name, queryset in hot_queries():
+            # SQLite explains with EXPLAIN QUERY PLAN, and PostgreSQL with EXPLAIN.
+            plan_lines = queryset.explain().splitlines()
+            full_scans = [line for line in plan_lines if is_full_scan(line)]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+
+            for line in plan_lines:
+                if line in full_scans:
+                    self.stdout.write(self.style.WARNING(f'  {line}  <- full table scan'))
+                else:
+                    self.stdout.write(f'  {line}')
+
+            if full_scans:
+                flagged.append(name)
+
+        if flagged:
+            self.stdout.write(self.style.WARNING(f'Full table scans in {len(flagged)} of {len(hot_queries())} queries on {connection.vendor}: {", ".join(flagged)}'))
+
+            if options['fail_on_scan']:
+                raise CommandError('Hot queries scan whole tables.')
+        else:
+            self.stdout.write(self.style.SUCCESS('No full table scans.'))
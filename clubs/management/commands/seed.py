@@ -1,382 +1,418 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
-from django.db.utils import IntegrityError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
 from faker import Faker
+from itertools import islice
+import os
 import random
-from clubs.models import User, Club, Membership
+from clubs import pairing, search, seeding
+from clubs.models import User, Club, Membership, Tournament, Co_oped, Participant, Group, Grouping, TournamentMatch
 
 class Command(BaseCommand):
     """The database seeder."""
 
+    help = 'Seeds the database with clubs, users and memberships.'
+
     PASSWORD = "Password123"
     APPLICANT_COUNT_PER_CLUB = 5
     CLUB_COUNT = 6
     MEMBER_COUNT_PER_CLUB = 20
     OFFICER_COUNT_PER_CLUB = 5
 
-    def __init__(self):
-        super().__init__()
-        self.faker = Faker('en_GB')
+    # Lifecycle phases tournaments are seeded in.
+    TOURNAMENT_LIFECYCLES = ('open', 'group_stage', 'knockout', 'ended')
+
+    # Models of tournament histories, in insertion order.
+    TOURNAMENT_MODELS = (Tournament, Co_oped, Participant, Group, Grouping, TournamentMatch)
+
+    # Rows inserted per transaction. Also bounds query parameters when reading back ids of created users.
+    BATCH_SIZE = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clubs', type = int, default = Command.CLUB_COUNT, help = 'Total clubs, including the specific clubs.')
+        parser.add_argument('--members-per-club', type = int, default = Command.MEMBER_COUNT_PER_CLUB, help = 'Members seeded per club.')
+        parser.add_argument('--officers', type = int, default = Command.OFFICER_COUNT_PER_CLUB, help = 'Officers seeded per club.')
+        parser.add_argument('--applicants', type = int, default = Command.APPLICANT_COUNT_PER_CLUB, help = 'Applicants seeded per club.')
+        parser.add_argument('--tournaments-per-club', type = int, default = 0, help = 'Tournaments seeded per club, in every lifecycle phase.')
+        parser.add_argument('--seed', type = int, default = None, help = 'Seed of random data, for a reproducible database.')
+        parser.add_argument('--batch-size', type = int, default = Command.BATCH_SIZE, help = 'Rows inserted per transaction.')
+        parser.add_argument('--workers', type = int, default = os.cpu_count() or 1, help = 'Processes generating random data. Defaults to the number of CPUs.')
 
     def handle(self, *args, **options):
+        for option in ('clubs', 'members_per_club', 'officers', 'applicants', 'tournaments_per_club'):
+            if options[option] < 0:
+                raise CommandError(f'--{option.replace("_", "-")} must not be negative.')
+
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        if options['workers'] < 1:
+            raise CommandError('--workers must be positive.')
+
+        self.faker = Faker('en_GB')
+        self.random = random.Random(options['seed'])
+
+        if options['seed'] is not None:
+            self.faker.seed_instance(options['seed'])
+
+        self.batch_size = options['batch_size']
+        self.workers = options['workers']
+        # Sub seeds of batches generated in parallel are derived from this.
+        self.base_seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        # Hashed once, as hashing is deliberately slow, and shared by all seeded users.
+        self.password = make_password(Command.PASSWORD)
+        self.email_counter = (User.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
         self.create_specific_clubs()
-        self.create_user_Jebediah_and_memberships()
-        self.create_user_Valentina_and_memberships()
-        self.create_user_Billie_and_memberships()
+        self.create_specific_users_and_memberships()
         print()
-        self.seed_clubs()
+        self.seed_clubs(options['clubs'])
         print()
-        self.club_list = list(Club.objects.all())
-        for club in self.club_list:
-            print()
-            print(f'Seeding {club.name} Users')
-            self.seed_owner(club = club)
-            print()
-            self.seed_applicants(club = club)
-            print()
-            self.seed_members(club = club)
-            print()
-            self.seed_officers(club = club)
-            print()
 
-        print()
-        print('User and Clubs seeding complete.')
+        member_counts = [
+            (Membership.MemberTypes.CLUB_OWNER, 1),
+            (Membership.MemberTypes.APPLICANT, options['applicants']),
+            (Membership.MemberTypes.MEMBER, options['members_per_club']),
+            (Membership.MemberTypes.OFFICER, options['officers'])
+        ]
 
-    def _create_applicant(self, club):
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
-        email = self._email(first_name,last_name)
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        member_type = Membership.MemberTypes.APPLICANT
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = club,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = member_type
-        )
+        self.seed_memberships(member_counts)
 
-    def _create_club(self):
-        name = self.faker.first_name()
-        Club.objects.create(
-            name = self._club_name(name),
-            location = self.faker.address(),
-            description = self.faker.text(max_nb_chars=500)
-        )
+        if options['tournaments_per_club']:
+            self.seed_tournaments(options['tournaments_per_club'])
 
-    def _create_owner(self,club):
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
-        email = self._email(first_name,last_name)
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        member_type = Membership.MemberTypes.CLUB_OWNER
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = club,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = member_type
-        )
+        # Bulk inserts bypass the signals keeping the search index and cached navbars up to date.
+        search.rebuild_index()
+        cache.clear()
+        print()
+        print('User and Clubs seeding complete.')
 
-    def _create_member(self,club):
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
-        email = self._email(first_name,last_name)
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        member_type = Membership.MemberTypes.MEMBER
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = club,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = member_type
-        )
+    def _member_data(self, first_name, last_name, email):
+        """Return random fields of user and membership, with names and email given."""
+        return {
+            'email' : email,
+            'member_first_name' : first_name,
+            'member_last_name' : last_name,
+            'member_contact_details' : self._contact_details(),
+            'member_personal_statement' : self.faker.text(max_nb_chars=200),
+            'member_bio' : self.faker.text(max_nb_chars=500),
+            'member_chess_experience_level' : self.random.randint(0,3)
+        }
 
-    def _create_officer(self,club):
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
-        email = self._email(first_name,last_name)
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        member_type = Membership.MemberTypes.OFFICER
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = club,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = member_type
-        )
+    def _create_users_and_memberships(self, memberships_data):
+        """
+        Create, in one transaction, users and memberships from list of pairs of
+        member data and list of (club, member type) of memberships of member.
+        """
 
-    def create_specific_applicant(self):
-        first_name = "Yoyo"
-        last_name = "Ma"
-        email = "yoyo@example.org"
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = self.club_Kerbal,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.APPLICANT
-        )
+        with transaction.atomic():
+            User.objects.bulk_create([
+                User(email = data['email'], email_hash = User.hash_email(data['email']), password = self.password)
+                for data, club_member_types in memberships_data
+            ])
+            # Primary keys are not set by bulk_create on every database, so created users are read back by email.
+            user_ids = dict(User.objects.filter(email__in = [data['email'] for data, club_member_types in memberships_data]).values_list('email', 'id'))
+            memberships = []
 
-    def create_user_Jebediah_and_memberships(self):
-        first_name = "Jebediah"
-        last_name = "Kerman"
-        email = "jeb@example.org"
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = self.club_Kerbal,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.MEMBER
-        )
-        Membership.objects.create(
-            club = self.club_Alpha,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.OFFICER
-        )
+            for data, club_member_types in memberships_data:
+                fields = {name : value for name, value in data.items() if name != 'email'}
 
+                for club, member_type in club_member_types:
+                    memberships.append(Membership(club = club, member_id = user_ids[data['email']], member_type = member_type, **fields))
 
-    def create_user_Valentina_and_memberships(self):
-        first_name = "Valentina"
-        last_name = "Kerman"
-        email = "val@example.org"
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = self.club_Kerbal,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.MEMBER
-        )
-        Membership.objects.create(
-            club = self.club_Beta,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.CLUB_OWNER
-        )
+            Membership.objects.bulk_create(memberships)
 
-    def create_user_Billie_and_memberships(self):
-        first_name = "Billie"
-        last_name = "Kerman"
-        email = "billie@example.org"
-        contact_details = self._contact_details()
-        chess_experience_level = random.randint(0,3)
-        personal_statement = self.faker.text(max_nb_chars=200)
-        bio = self.faker.text(max_nb_chars=500)
-        user = User.objects.create_user(
-            email=email,
-            password=Command.PASSWORD
-        )
-        Membership.objects.create(
-            club = self.club_Kerbal,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.MEMBER
-        )
-        Membership.objects.create(
-            club = self.club_Omega,
-            member = user,
-            member_first_name = first_name,
-            member_last_name = last_name,
-            member_contact_details = contact_details,
-            member_personal_statement = personal_statement,
-            member_bio = bio,
-            member_chess_experience_level = chess_experience_level,
-            member_type = Membership.MemberTypes.MEMBER
-        )
+    def create_specific_users_and_memberships(self):
+        self._create_users_and_memberships([
+            (
+                self._member_data("Jebediah", "Kerman", "jeb@example.org"),
+                [(self.club_Kerbal, Membership.MemberTypes.MEMBER), (self.club_Alpha, Membership.MemberTypes.OFFICER)]
+            ),
+            (
+                self._member_data("Valentina", "Kerman", "val@example.org"),
+                [(self.club_Kerbal, Membership.MemberTypes.MEMBER), (self.club_Beta, Membership.MemberTypes.CLUB_OWNER)]
+            ),
+            (
+                self._member_data("Billie", "Kerman", "billie@example.org"),
+                [(self.club_Kerbal, Membership.MemberTypes.MEMBER), (self.club_Omega, Membership.MemberTypes.MEMBER)]
+            )
+        ])
 
     def create_specific_clubs(self):
-        self.club_Kerbal = Club.objects.create(
-            name = "Kerbal Chess Club",
-            location = self.faker.address(),
-            description = self.faker.text(max_nb_chars=500)
-        )
-        self.club_Alpha = Club.objects.create(
-            name = "Alpha Chess Club",
-            location = self.faker.address(),
-            description = self.faker.text(max_nb_chars=500)
-        )
-        self.club_Beta = Club.objects.create(
-            name = "Beta Chess Club",
-            location = self.faker.address(),
-            description = self.faker.text(max_nb_chars=500)
-        )
-        self.club_Omega = Club.objects.create(
-            name = "Omega Chess Club",
-            location = self.faker.address(),
-            description = self.faker.text(max_nb_chars=500)
-        )
+        Club.objects.bulk_create([
+            Club(
+                name = name,
+                location = self.faker.address(),
+                description = self.faker.text(max_nb_chars=500)
+            )
+            for name in ("Kerbal Chess Club", "Alpha Chess Club", "Beta Chess Club", "Omega Chess Club")
+        ])
+        self.club_Kerbal = Club.objects.get(name = "Kerbal Chess Club")
+        self.club_Alpha = Club.objects.get(name = "Alpha Chess Club")
+        self.club_Beta = Club.objects.get(name = "Beta Chess Club")
+        self.club_Omega = Club.objects.get(name = "Omega Chess Club")
 
     def _contact_details(self):
         return f'+44 {self.faker.msisdn()[3:]}'
 
     def _email(self, first_name, last_name):
-        email = f'{first_name}.{last_name}@example.org'
+        # Numbered, so emails are unique without retrying on duplicates.
+        email = f'{first_name}.{last_name}.{self.email_counter}@example.org'.lower()
+        self.email_counter += 1
         return email
 
-    def _club_name(self, name):
+    def _club_name(self, name, taken_names):
+        # Numbered when taken, so names are unique without retrying on duplicates.
         name = f'{name} Chess Club'
-        return name
+        unique_name = name
+        counter = 2
+
+        while unique_name in taken_names:
+            unique_name = f'{name} {counter}'
+            counter += 1
+
+        taken_names.add(unique_name)
+        return unique_name
 
-    def seed_clubs(self):
+    def _batch_counts(self, total):
+        """Return counts of batches of total rows."""
+        return [min(self.batch_size, total - start) for start in range(0, total, self.batch_size)]
+
+    def seed_clubs(self, club_total):
         club_count = Club.objects.all().count()
-        seed_try = club_count
+        taken_names = set(Club.objects.values_list('name', flat = True))
         print(f'Clubs seeded: {club_count}',  end='\r')
-        while seed_try < Command.CLUB_COUNT:
-            try:
-                club = self._create_club()
-                club_count += 1
-                print(f'Clubs seeded: {club_count}',  end='\r')
-            except (IntegrityError):
-                continue
-            seed_try += 1
-
-    def seed_applicants(self,club):
-        member_type = Membership.MemberTypes.APPLICANT
-        applicant_count = Membership.objects.filter(club = club, member_type = member_type).count()
-        seed_try = applicant_count
-        print(f'{club.name} Applicants seeded: {applicant_count}',  end='\r')
-        while seed_try < Command.APPLICANT_COUNT_PER_CLUB:
-            try:
-                self._create_applicant(club)
-                applicant_count += 1
-                print(f'{club.name} Applicants seeded: {applicant_count}',  end='\r')
-            except (IntegrityError):
-                continue
-            seed_try += 1
-
-    def seed_officers(self,club):
-        member_type = Membership.MemberTypes.OFFICER
-        officer_count = Membership.objects.filter(club = club, member_type = member_type).count()
-        seed_try = officer_count
-        print(f'{club.name} Officers seeded: {officer_count}',  end='\r')
-        while seed_try < Command.OFFICER_COUNT_PER_CLUB:
-            try:
-                self._create_officer(club)
-                officer_count += 1
-                print(f'{club.name} Officers seeded: {officer_count}',  end='\r')
-            except (IntegrityError):
-                continue
-            seed_try += 1
-
-    def seed_members(self,club):
-        member_type = Membership.MemberTypes.MEMBER
-        member_count = Membership.objects.filter(club = club, member_type = member_type).count()
-        seed_try = member_count
-        print(f'{club.name} Members seeded: {member_count}',  end='\r')
-        while seed_try < Command.MEMBER_COUNT_PER_CLUB:
-            try:
-                self._create_member(club)
-                member_count += 1
-                print(f'{club.name} Members seeded: {member_count}',  end='\r')
-            except (IntegrityError):
-                continue
-            seed_try += 1
-
-    def seed_owner(self,club):
-        member_type = Membership.MemberTypes.CLUB_OWNER
-        owner_count = Membership.objects.filter(club = club, member_type = member_type).count()
-        seed_try = owner_count
-        print(f'{club.name} Owner seeded: {owner_count}',  end='\r')
-        while seed_try < 1:
-            try:
-                self._create_owner(club)
-                owner_count += 1
-                print(f'{club.name} Owner seeded: {owner_count}',  end='\r')
-            except (IntegrityError):
+        batch_counts = self._batch_counts(max(club_total - club_count, 0))
+
+        for clubs_data in seeding.generate_batches(seeding.generate_clubs, self.base_seed, batch_counts, self.workers):
+            with transaction.atomic():
+                Club.objects.bulk_create([
+                    Club(name = self._club_name(name, taken_names), location = location, description = description)
+                    for name, location, description in clubs_data
+                ])
+
+            club_count += len(clubs_data)
+            print(f'Clubs seeded: {club_count}',  end='\r')
+
+    def _missing_memberships(self, member_counts):
+        """Yield (club, member type) of each membership missing for each club to have the count of memberships of each member type."""
+        existing_counts = Membership.objects.values_list('club_id', 'member_type').annotate(count = Count('id'))
+        existing_counts = {(club_id, member_type) : count for club_id, member_type, count in existing_counts}
+
+        for club in Club.objects.order_by('id'):
+            for member_type, member_total in member_counts:
+                for counter in range(existing_counts.get((club.id, member_type), 0), member_total):
+                    yield (club, member_type)
+
+    def seed_memberships(self, member_counts):
+        """
+        Seed memberships of every club, until it has the count of memberships
+        of each member type. Random fields are generated in parallel and
+        inserted in batches, which may span several clubs.
+        """
+
+        membership_total = sum(1 for membership in self._missing_memberships(member_counts))
+        missing_memberships = self._missing_memberships(member_counts)
+        membership_count = 0
+        print(f'Memberships seeded: {membership_count}/{membership_total}',  end='\r')
+        batches = seeding.generate_batches(seeding.generate_members, self.base_seed, self._batch_counts(membership_total), self.workers)
+
+        for members_data in batches:
+            memberships_data = []
+
+            for data, (club, member_type) in zip(members_data, islice(missing_memberships, len(members_data))):
+                data['email'] = self._email(data['member_first_name'], data['member_last_name'])
+                memberships_data.append((data, [(club, member_type)]))
+
+            self._create_users_and_memberships(memberships_data)
+            membership_count += len(memberships_data)
+            print(f'Memberships seeded: {membership_count}/{membership_total}',  end='\r')
+
+        print()
+
+    def seed_tournaments(self, tournament_count_per_club):
+        """
+        Seed tournaments of each club, in every lifecycle phase, with their
+        participants, groups, groupings and matches.
+
+        Histories are played out in memory, the way advancement would play
+        them, and inserted in bulk with primary keys assigned here, as
+        bulk_create does not return them on every database.
+        """
+
+        self.next_ids = {model : (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1 for model in Command.TOURNAMENT_MODELS}
+        self.tournament_rows = {model : [] for model in Command.TOURNAMENT_MODELS}
+        self.now = timezone.now()
+        memberships = Membership.objects.exclude(member_type = Membership.MemberTypes.APPLICANT).order_by('club_id', 'id').values_list('club_id', 'id')
+        membership_ids_per_club = defaultdict(list)
+
+        for club_id, membership_id in memberships:
+            membership_ids_per_club[club_id].append(membership_id)
+
+        print()
+
+        for club in Club.objects.order_by('id'):
+            membership_ids = membership_ids_per_club[club.id]
+
+            if not membership_ids:
                 continue
-            seed_try += 1
+
+            for counter in range(1, tournament_count_per_club + 1):
+                self._seed_tournament(club, membership_ids)
+
+                if sum(len(rows) for rows in self.tournament_rows.values()) >= self.batch_size:
+                    self._insert_tournament_rows()
+
+                print(f'{club.name} Tournaments seeded: {counter}',  end='\r')
+
+            print()
+
+        self._insert_tournament_rows()
+
+        # Primary keys were assigned here, so sequences of databases such as PostgreSQL must catch up.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), Command.TOURNAMENT_MODELS):
+                cursor.execute(sql)
+
+    def _insert_tournament_rows(self):
+        with transaction.atomic():
+            for model in Command.TOURNAMENT_MODELS:
+                model.objects.bulk_create(self.tournament_rows[model])
+                self.tournament_rows[model] = []
+
+    def _add_tournament_row(self, model, **fields):
+        """Add row of model to be inserted, with next primary key of model, and return it."""
+        row = model(id = self.next_ids[model], **fields)
+        self.next_ids[model] += 1
+        self.tournament_rows[model].append(row)
+        return row
+
+    def _seed_tournament(self, club, membership_ids):
+        """Seed tournament of club, organised by and participated in by memberships of ids, in random lifecycle phase."""
+        lifecycle = self.random.choice(Command.TOURNAMENT_LIFECYCLES)
+        organiser_id, *other_ids = self.random.sample(membership_ids, min(len(membership_ids), 3))
+        co_organiser_ids = other_ids[:self.random.randint(0, len(other_ids))]
+        eligible_ids = [membership_id for membership_id in membership_ids if membership_id not in (organiser_id, *co_organiser_ids)]
+
+        # Group stages need 16 participants, and any phase after open needs 2.
+        if (lifecycle == 'group_stage') and (len(eligible_ids) < 16):
+            lifecycle = 'knockout'
+        if (lifecycle != 'open') and (len(eligible_ids) < 2):
+            lifecycle = 'open'
+
+        minimum = 16 if lifecycle == 'group_stage' else 2
+        total_participants_limit = self.random.randint(minimum, 96)
+
+        if lifecycle == 'open':
+            participant_count = self.random.randint(0, min(len(eligible_ids), total_participants_limit - 1))
+            deadline = self.now + timedelta(days = self.random.randint(1, 60))
+        else:
+            participant_count = self.random.randint(minimum, min(len(eligible_ids), total_participants_limit))
+            deadline = self.now - timedelta(days = self.random.randint(1, 365))
+
+        tournament = self._add_tournament_row(
+            Tournament,
+            club = club,
+            organiser_id = organiser_id,
+            name = f'{self.faker.city()} {self.random.choice(("Open", "Cup", "Championship", "Classic"))}'[:50],
+            description = self.faker.text(max_nb_chars=200),
+            deadline = deadline,
+            total_participants_limit = total_participants_limit,
+            participant_count = participant_count
+        )
+
+        for co_organiser_id in co_organiser_ids:
+            self._add_tournament_row(Co_oped, tournament_id = tournament.id, co_organiser_id = co_organiser_id)
+
+        participants = [
+            self._add_tournament_row(Participant, tournament_id = tournament.id, member_id = member_id)
+            for member_id in self.random.sample(eligible_ids, participant_count)
+        ]
+
+        if lifecycle != 'open':
+            self._play_tournament(tournament, {participant.id : participant for participant in participants}, lifecycle)
+
+    def _play_tournament(self, tournament, participants, lifecycle):
+        """
+        Play phases of tournament with participants, keyed by id, until the
+        phase of lifecycle, the way advancement would. The last phase of group
+        stage and knockout tournaments is left active and partly played.
+        """
+
+        head_to_head = defaultdict(int)
+        remaining_ids = sorted(participants)
+
+        while len(remaining_ids) > 1:
+            group_type, group_size = pairing.group_type_and_size(len(remaining_ids))
+            tournament.phase += 1
+            last_phase = (lifecycle == 'group_stage') or ((lifecycle == 'knockout') and (group_type != Group.Types.GROUP))
+            participant_ids_per_group = pairing.pair_participants(remaining_ids, group_size, head_to_head)
+            grouped_ids = {participant_id for group_participant_ids in participant_ids_per_group for participant_id in group_participant_ids}
+            # Participants left out of every group are not eliminated, as in advancement.
+            qualified_ids = [participant_id for participant_id in remaining_ids if participant_id not in grouped_ids]
+
+            for counter, group_participant_ids in enumerate(participant_ids_per_group, 1):
+                group = self._add_tournament_row(
+                    Group,
+                    tournament_id = tournament.id,
+                    is_active = last_phase,
+                    type = group_type,
+                    number = None if group_type == Group.Types.FINAL else counter,
+                    total_participants_limit = group_size
+                )
+                groupings = [
+                    self._add_tournament_row(Grouping, group_id = group.id, participant_id = participant_id)
+                    for participant_id in group_participant_ids
+                ]
+                self._play_group(tournament, group, groupings, head_to_head, last_phase)
+
+                if not last_phase:
+                    # Same qualification as advancement, fewest points in group first.
+                    groupings.sort(key = lambda grouping: (grouping.points_in_group, grouping.id))
+                    qualified_count = 2 if group_size >= 4 else 1
+                    qualified_ids.extend(grouping.participant_id for grouping in groupings[:qualified_count])
+
+                    for grouping in groupings[qualified_count:]:
+                        participants[grouping.participant_id].eliminated = True
+
+            if last_phase:
+                return
+
+            remaining_ids = sorted(qualified_ids)
+
+        tournament.phase += 1
+        tournament.is_active = False
+
+        for participant_id in remaining_ids:
+            participants[participant_id].won = True
+            participants[participant_id].eliminated = True
+
+    def _play_group(self, tournament, group, groupings, head_to_head, partly):
+        """Add round robin matches of group, with random conclusions, leaving some open if partly played."""
+        for counter1 in range(len(groupings) - 1):
+            for counter2 in range(counter1 + 1, len(groupings)):
+                player1 = groupings[counter1]
+                player2 = groupings[counter2]
+                conclusion = None
+
+                if not (partly and self.random.random() < 0.5):
+                    conclusion = self.random.choice(TournamentMatch.ConclusionTypes.values)
+                    player1_points, player2_points = TournamentMatch.conclusion_points(conclusion)
+                    player1.points_in_group += player1_points
+                    player2.points_in_group += player2_points
+                    head_to_head[pairing.pair_key(player1.participant_id, player2.participant_id)] += 1
+
+                self._add_tournament_row(
+                    TournamentMatch,
+                    tournament_id = tournament.id,
+                    group_id = group.id,
+                    player1_id = player1.id,
+                    player2_id = player2.id,
+                    conclusion = conclusion
+                )
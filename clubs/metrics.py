@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from django.template.backends.django import DjangoTemplates
+import threading
+import time
+
+# Upper bounds of histogram buckets, of seconds and of query counts. The last bucket has no upper bound.
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Name, buckets and help of each metric recorded per view.
+METRICS = (
+    ('queries', QUERIES_BUCKETS, 'Database queries per request.'),
+    ('db_time_seconds', SECONDS_BUCKETS, 'Time spent in database queries per request.'),
+    ('template_time_seconds', SECONDS_BUCKETS, 'Time spent rendering templates per request.'),
+    ('wall_time_seconds', SECONDS_BUCKETS, 'Time spent handling request.'),
+)
+
+# Measurement of the request being handled, if any, in this thread or task.
+current_measurement = ContextVar('current_measurement', default = None)
+
+class Measurement:
+    """Queries, database time, template render time and wall time of a request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time_seconds = 0
+        self.template_time_seconds = 0
+        self.wall_time_seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Execute query, counting it and its time. Used as database execute wrapper."""
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time_seconds += time.perf_counter() - start
+            self.queries += 1
+
+class Histogram:
+    """Count and sum of observed values, and count of values per bucket."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+class Registry:
+    """Histograms of each metric, per view."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, view_name, measurement):
+        with self._lock:
+            if view_name not in self._histograms:
+                self._histograms[view_name] = {name : Histogram(buckets) for name, buckets, help_text in METRICS}
+
+            for name, histogram in self._histograms[view_name].items():
+                histogram.observe(getattr(measurement, name))
+
+    def get_histogram(self, view_name, name):
+        """Return histogram of metric of view, or None if view has no recorded requests."""
+        with self._lock:
+            return self._histograms.get(view_name, {}).get(name)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def export(self):
+        """Return histograms in Prometheus text exposition format."""
+        lines = []
+
+        with self._lock:
+            for name, buckets, help_text in METRICS:
+                lines.append(f'# HELP view_{name} {help_text}')
+                lines.append(f'# TYPE view_{name} histogram')
+
+                for view_name in sorted(self._histograms):
+                    histogram = self._histograms[view_name][name]
+                    cumulative_count = 0
+
+                    for bound, bucket_count in zip((*buckets, '+Inf'), histogram.bucket_counts):
+                        cumulative_count += bucket_count
+                        lines.append(f'view_{name}_bucket{{view="{view_name}",le="{bound}"}} {cumulative_count}')
+
+                    lines.append(f'view_{name}_sum{{view="{view_name}"}} {histogram.sum}')
+                    lines.append(f'view_{name}_count{{view="{view_name}"}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+class TimedTemplate:
+    """Template timing its rendering into measurement of current request."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context = None, request = None):
+        measurement = current_measurement.get()
+
+        if measurement is None:
+            return self.template.render(context, request)
+
+        start = time.perf_counter()
+
+        try:
+            return self.template.render(context, request)
+        finally:
+            measurement.template_time_seconds += time.perf_counter() - start
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend timing rendering of templates, for metrics of views."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
@@ -0,0 +1,142 @@
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from pathlib import Path
+from clubs import metrics
+from clubs import routers
+import cProfile
+import io
+import itertools
+import logging
+import pstats
+import time
+
+logger = logging.getLogger(__name__)
+
+class ViewMetricsMiddleware:
+    """
+    Records queries, database time, template render time and wall time of
+    each request, per resolved URL name, and logs a warning when a view
+    exceeds its budget in settings.VIEW_BUDGETS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        measurement = metrics.Measurement()
+        token = metrics.current_measurement.set(measurement)
+        start = time.perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(measurement))
+
+                response = self.get_response(request)
+        finally:
+            measurement.wall_time_seconds = time.perf_counter() - start
+            metrics.current_measurement.reset(token)
+
+        view_name = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        metrics.registry.record(view_name, measurement)
+        self.check_budget(view_name, measurement)
+        return response
+
+    def check_budget(self, view_name, measurement):
+        """Log a warning for each metric of measurement over budget of view."""
+        for name, limit in settings.VIEW_BUDGETS.get(view_name, {}).items():
+            value = getattr(measurement, name)
+
+            if value > limit:
+                logger.warning('View %s exceeded budget of %s: %s > %s', view_name, name, value, limit)
+
+class ProfilingMiddleware:
+    """
+    Profiles one in settings.PROFILING_SAMPLE_RATE requests, and requests of
+    staff users carrying header settings.PROFILING_HEADER, writing a .prof
+    file and a summary of the top functions of each into
+    settings.PROFILING_DIR, which keeps the latest settings.PROFILING_MAX_FILES
+    profiles. Not used at all when both are disabled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.header = settings.PROFILING_HEADER and ('HTTP_' + settings.PROFILING_HEADER.upper().replace('-', '_'))
+
+        if not (self.sample_rate or self.header):
+            raise MiddlewareNotUsed()
+
+        self.counter = itertools.count(1)
+
+    def __call__(self, request):
+        if not self.is_profiled(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+
+        self.save_profile(request, profiler)
+        return response
+
+    def is_profiled(self, request):
+        if self.sample_rate and ((next(self.counter) % self.sample_rate) == 0):
+            return True
+
+        # User is only looked up for requests carrying the header.
+        return bool(self.header and (self.header in request.META) and request.user.is_staff)
+
+    def save_profile(self, request, profiler):
+        """Write profile and its summary, then remove oldest profiles over the limit."""
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents = True, exist_ok = True)
+        view_name = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        name = f'{timezone.now():%Y%m%d%H%M%S%f}-{view_name.replace(":", "_")}'
+        profiler.dump_stats(directory / f'{name}.prof')
+
+        summary = io.StringIO()
+        summary.write(f'{request.method} {request.get_full_path()}\n')
+        pstats.Stats(profiler, stream = summary).sort_stats('cumulative').print_stats(settings.PROFILING_SUMMARY_FUNCTIONS)
+        (directory / f'{name}.txt').write_text(summary.getvalue())
+        logger.info('Profiled %s %s into %s.prof', request.method, request.get_full_path(), name)
+
+        # Names start with time of profile, so sort oldest first.
+        for path in sorted(directory.glob('*.prof'))[:-settings.PROFILING_MAX_FILES]:
+            path.unlink(missing_ok = True)
+            path.with_suffix('.txt').unlink(missing_ok = True)
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets database router send reads of safe requests to replicas, and pins
+    requests of a session to primary for settings.REPLICA_PIN_SECONDS after
+    a request of the session writes, so the session reads its own writes.
+    """
+
+    SESSION_KEY = 'primary_pinned_until'
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned = (request.method not in self.SAFE_METHODS) or (request.session.get(self.SESSION_KEY, 0) > time.time())
+        state = routers.RequestState(pinned)
+        token = routers.request_state.set(state)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.request_state.reset(token)
+
+        if state.wrote:
+            request.session[self.SESSION_KEY] = time.time() + settings.REPLICA_PIN_SECONDS
+
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.5 on 2026-10-17 17:54
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_participants(apps, schema_editor):
+    Tournament = apps.get_model('clubs', 'Tournament')
+
+    for tournament in Tournament.objects.annotate(total = Count('participant')).filter(total__gt = 0):
+        Tournament.objects.filter(id = tournament.id).update(participant_count = tournament.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0039_rename_participant_amount_limit_tournament_total_participants_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='participant_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-17 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0040_tournament_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='phase',
+            field=models.IntegerField(default=0),
+        ),
+    ]
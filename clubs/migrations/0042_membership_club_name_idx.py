@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0041_tournament_phase'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['club', 'member_first_name', 'member_last_name', 'id'], name='membership_club_name_idx'),
+        ),
+    ]
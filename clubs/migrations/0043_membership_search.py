@@ -0,0 +1,21 @@
+from django.db import migrations
+from clubs import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_index(schema_editor, apps.get_model('clubs', 'Membership'))
+
+
+def delete_search_index(apps, schema_editor):
+    search.delete_index(schema_editor, apps.get_model('clubs', 'Membership'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0042_membership_club_name_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, delete_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.5 on 2026-10-17 18:08
+
+from hashlib import md5
+from django.db import migrations, models
+
+
+def hash_emails(apps, schema_editor):
+    User = apps.get_model('clubs', 'User')
+    users = []
+
+    for user in User.objects.only('id', 'email').iterator():
+        user.email_hash = md5(user.email.strip().lower().encode('utf-8')).hexdigest()
+        users.append(user)
+
+    User.objects.bulk_update(users, ['email_hash'], batch_size = 500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0043_membership_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(hash_emails, migrations.RunPython.noop),
+    ]
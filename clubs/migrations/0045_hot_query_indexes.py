@@ -0,0 +1,41 @@
+# Generated by Django 3.2.5 on 2026-10-17 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0044_user_email_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['tournament', 'is_active'], name='group_tournament_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['club', 'member_type'], name='membership_club_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['tournament', 'won'], name='participant_tourn_won_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['tournament', 'eliminated'], name='participant_tourn_elim_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['club', 'is_active', 'deadline'], name='tournament_club_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournamentmatch',
+            index=models.Index(fields=['tournament', 'conclusion'], name='match_tourn_conclusion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tournamentmatch',
+            index=models.Index(fields=['group', 'conclusion'], name='match_group_conclusion_idx'),
+        ),
+    ]
@@ -1,9 +1,11 @@
+from django.conf import settings
+from django.urls import reverse
 from django.utils import timezone
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.core.validators import MaxValueValidator, MinValueValidator
-from libgravatar import Gravatar
+from hashlib import md5
 
 class UserManager(BaseUserManager):
 
@@ -51,6 +53,9 @@ class User(AbstractBaseUser):
         unique = True,
     )
 
+    # Gravatar hash of email, kept up to date by signal on save.
+    email_hash = models.CharField(max_length = 32, blank = True, editable = False)
+
     is_active = models.BooleanField(default = True)
     is_admin = models.BooleanField(default = False)
     clubs = models.ManyToManyField('Club', through = 'Membership')
@@ -64,11 +69,17 @@ class User(AbstractBaseUser):
     # Fields prompted when creating superuser. Have default values in UserManager class for those not listed here.
     REQUIRED_FIELDS = []
 
+    @staticmethod
+    def hash_email(email):
+        """Return gravatar hash of email."""
+        return md5(email.strip().lower().encode('utf-8')).hexdigest()
+
     def gravatar(self, size=120):
-       """Return a URL to the user's gravatar."""
-       gravatar_object = Gravatar(self.email)
-       gravatar_url = gravatar_object.get_image(size=size, default='mp')
-       return gravatar_url
+        """Return a URL to the user's gravatar, or to locally generated avatar if enabled."""
+        if settings.USE_LOCAL_AVATARS:
+            return reverse('avatar', kwargs = {'email_hash' : self.email_hash, 'size' : size})
+        else:
+            return f'https://www.gravatar.com/avatar/{self.email_hash}?size={size}&default=mp'
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar."""
@@ -179,6 +190,12 @@ class Membership(models.Model):
     class Meta:
 
         unique_together = [['club', 'member']]
+        indexes = [
+            # Supports keyset pagination of member list.
+            models.Index(fields = ['club', 'member_first_name', 'member_last_name', 'id'], name = 'membership_club_name_idx'),
+            # Supports memberships of club of a member type, such as officers.
+            models.Index(fields = ['club', 'member_type'], name = 'membership_club_type_idx'),
+        ]
 
 class Tournament(models.Model):
 
@@ -204,17 +221,34 @@ class Tournament(models.Model):
         ]
     )
 
+    # Number of phases tournament has been advanced through, used to advance each phase only once.
+    phase = models.IntegerField(blank = False, default = 0)
+
+    # Number of participants in tournament, kept up to date by signals on Participant.
+    participant_count = models.IntegerField(blank = False, default = 0)
+
+    class Meta:
+
+        indexes = [
+            # Supports active or ended tournaments of club, such as joinable tournaments and winners.
+            models.Index(fields = ['club', 'is_active', 'deadline'], name = 'tournament_club_active_idx'),
+        ]
+
     def passed_deadline(self):
         """Checks if deadline is passed."""
         return self.deadline < timezone.now()
 
+    def is_full(self):
+        """Checks if total participants limit is reached."""
+        return self.total_participants_limit <= self.participant_count
+
     def get_winner(self):
         """Return winner of tournament."""
         return self.participant_set.filter(won = True)
 
     def total_participants(self):
         """Returns total number of participants in tournament."""
-        return self.participant_set.count()
+        return self.participant_count
 
     def _validation_check(self):
         """Validation for fields."""
@@ -308,6 +342,10 @@ class Group(models.Model):
     class Meta:
 
         ordering = ['number']
+        indexes = [
+            # Supports active groups of tournament.
+            models.Index(fields = ['tournament', 'is_active'], name = 'group_tournament_active_idx'),
+        ]
 
     def _validation_check(self):
         """Validation for fields."""
@@ -331,6 +369,11 @@ class Participant(models.Model):
     class Meta:
 
         unique_together = [['tournament', 'member']]
+        indexes = [
+            # Support winner and remaining participants of tournament.
+            models.Index(fields = ['tournament', 'won'], name = 'participant_tourn_won_idx'),
+            models.Index(fields = ['tournament', 'eliminated'], name = 'participant_tourn_elim_idx'),
+        ]
 
     def _validation_check(self):
         """Validation for fields."""
@@ -401,9 +444,24 @@ class TournamentMatch(models.Model):
         """Return if match concluded."""
         return self.conclusion != None
 
+    @staticmethod
+    def conclusion_points(conclusion):
+        """Return points in group gained by player1 and player2 for conclusion."""
+        if (conclusion == TournamentMatch.ConclusionTypes.DRAW):
+            return (0.5, 0.5)
+        elif (conclusion == TournamentMatch.ConclusionTypes.PLAYER_1_WINS):
+            return (1, 0)
+        else:
+            return (0, 1)
+
     class Meta:
 
         unique_together = [['group', 'player1', 'player2']]
+        indexes = [
+            # Support open matches of tournament and of group.
+            models.Index(fields = ['tournament', 'conclusion'], name = 'match_tourn_conclusion_idx'),
+            models.Index(fields = ['group', 'conclusion'], name = 'match_group_conclusion_idx'),
+        ]
 
     def _validation_check(self):
         """Validation for fields."""
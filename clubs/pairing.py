@@ -0,0 +1,104 @@
+from collections import defaultdict
+from clubs.models import Group, Grouping, TournamentMatch
+
+def pair_key(participant1_id, participant2_id):
+    """Return key of head to head matrix for pair of participants."""
+    if participant1_id < participant2_id:
+        return (participant1_id, participant2_id)
+    else:
+        return (participant2_id, participant1_id)
+
+def load_head_to_head(tournament):
+    """Return head to head matrix, counting concluded matches between each pair of participants of tournament."""
+    head_to_head = defaultdict(int)
+    tournament_matches = TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = False)
+
+    for participant1_id, participant2_id in tournament_matches.values_list('player1__participant_id', 'player2__participant_id'):
+        head_to_head[pair_key(participant1_id, participant2_id)] += 1
+
+    return head_to_head
+
+def group_type_and_size(total_participants):
+    """Return group type and group total participants limit for next phase of tournament with total participants."""
+    if total_participants >= 32:
+        return (Group.Types.GROUP, 6)
+    elif total_participants >= 16:
+        return (Group.Types.GROUP, 4)
+    elif total_participants >= 8:
+        return (Group.Types.QUARTER_FINAL, 2)
+    elif total_participants >= 4:
+        return (Group.Types.SEMI_FINAL, 2)
+    elif total_participants >= 2:
+        return (Group.Types.FINAL, 2)
+    else:
+        return (None, None)
+
+def pair_participants(participant_ids, group_size, head_to_head):
+    """
+    Split participant ids into groups of group size.
+
+    Each group is led by the first remaining participant, who is joined by the
+    remaining participants it has faced the fewest times, in order. The leading
+    participant is placed last in its group. Splitting stops when one or no
+    participant remains.
+    """
+
+    remaining = list(participant_ids)
+    groups = []
+
+    while len(remaining) > 1:
+        participant_id = remaining.pop(0)
+        matches_participated_limit = 0
+        group = []
+
+        while (len(group) < (group_size - 1)) and remaining:
+            found = None
+
+            while found is None:
+                for other_id in remaining:
+                    if head_to_head[pair_key(participant_id, other_id)] == matches_participated_limit:
+                        found = other_id
+                        break
+                else:
+                    matches_participated_limit = matches_participated_limit + 1
+
+            group.append(found)
+            remaining.remove(found)
+
+        group.append(participant_id)
+        groups.append(group)
+
+    return groups
+
+def create_groups(tournament, participant_ids):
+    """
+    Create groups and groupings of next phase of tournament, for participants,
+    and return created groups. Groups of previous phase must already be inactive.
+    """
+    group_type, group_size = group_type_and_size(len(participant_ids))
+
+    if group_type is None:
+        return []
+
+    head_to_head = load_head_to_head(tournament)
+    participant_ids_per_group = pair_participants(participant_ids, group_size, head_to_head)
+    Group.objects.bulk_create([
+        Group(
+            tournament = tournament,
+            type = group_type,
+            number = None if group_type == Group.Types.FINAL else counter,
+            total_participants_limit = group_size
+        )
+        for counter in range(1, len(participant_ids_per_group) + 1)
+    ])
+
+    # Primary keys are not set by bulk_create on every database, so created groups are read back in number order.
+    groups = list(Group.objects.filter(tournament = tournament, is_active = True).order_by('number'))
+    groupings = []
+
+    for group, group_participant_ids in zip(groups, participant_ids_per_group):
+        for participant_id in group_participant_ids:
+            groupings.append(Grouping(group = group, participant_id = participant_id))
+
+    Grouping.objects.bulk_create(groupings)
+    return groups
@@ -0,0 +1,64 @@
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+import random
+
+PRIMARY = 'default'
+
+class RequestState:
+    """Routing state of request being handled, pinned to primary once or if it writes."""
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.wrote = False
+
+# State of request being handled, if any, in this thread or task.
+request_state = ContextVar('request_state', default = None)
+
+class ReplicaRouter:
+    """
+    Routes writes to primary database, and reads of requests to a replica in
+    settings.DATABASE_REPLICAS, unless request is pinned to primary, by having
+    written or by a recent write of its session, or reads are part of a
+    transaction. Reads outside requests, such as of commands, go to primary.
+    """
+
+    def _is_primary_only(self, model):
+        # Sessions are read right after being written, such as when logging in, and cache entries, such as club versions, right after being bumped.
+        return model._meta.app_label in ('sessions', 'django_cache')
+
+    def db_for_read(self, model, **hints):
+        state = request_state.get()
+
+        if (not settings.DATABASE_REPLICAS) or (state is None) or state.pinned or self._is_primary_only(model):
+            return PRIMARY
+
+        # Reads in transactions must see writes of transactions.
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = request_state.get()
+
+        if (state is not None) and not self._is_primary_only(model):
+            state.pinned = True
+            state.wrote = True
+
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = (PRIMARY, *settings.DATABASE_REPLICAS)
+
+        if (obj1._state.db in databases) and (obj2._state.db in databases):
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name = None, **hints):
+        # Replicas are copies of primary, migrated by it.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+
+        return None
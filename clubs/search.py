@@ -0,0 +1,118 @@
+import re
+from django.db import connection, connections
+from django.db.models import F, Q
+from clubs.models import Membership
+
+# Full text index of memberships on SQLite, an FTS5 table with rowid being id of membership.
+FTS_TABLE = 'clubs_membership_fts'
+
+# Name of GIN index of memberships on PostgreSQL.
+GIN_INDEX = 'membership_search_gin_idx'
+
+SEARCHED_FIELDS = ('member_first_name', 'member_last_name', 'member_bio')
+
+def _search_vector():
+    """Return search vector of memberships on PostgreSQL, matching expression of GIN index."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector(*SEARCHED_FIELDS, config = 'simple')
+
+def create_index(schema_editor, membership_model):
+    """Create full text index of memberships, for database of schema editor."""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(member_first_name, member_last_name, member_bio, tokenize = "unicode61")'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, member_first_name, member_last_name, member_bio) '
+            f'SELECT id, member_first_name, member_last_name, member_bio FROM {membership_model._meta.db_table}'
+        )
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        schema_editor.add_index(membership_model, GinIndex(_search_vector(), name = GIN_INDEX))
+
+def delete_index(schema_editor, membership_model):
+    """Delete full text index of memberships, for database of schema editor."""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX}')
+
+def index_membership(membership):
+    """Add or update membership in full text index. PostgreSQL indexes memberships by itself."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [membership.id])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, member_first_name, member_last_name, member_bio) VALUES (%s, %s, %s, %s)',
+                [membership.id, membership.member_first_name, membership.member_last_name, membership.member_bio]
+            )
+
+def unindex_membership(membership_id):
+    """Remove membership from full text index."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [membership_id])
+
+def rebuild_index():
+    """Rebuild full text index from all memberships, after writes bypassing signals such as bulk_create."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, member_first_name, member_last_name, member_bio) '
+                f'SELECT id, member_first_name, member_last_name, member_bio FROM {Membership._meta.db_table}'
+            )
+
+def _words(query):
+    """Return words of query, without any characters meaningful to full text query syntax."""
+    return re.findall(r'\w+', query)
+
+def search_memberships(memberships, query, page_size, page = 1):
+    """
+    Return page of memberships, out of queryset memberships, matching all
+    words of query as prefixes in first name, last name or bio, best matches
+    first, and if there is a next page.
+    """
+
+    words = _words(query)
+
+    if not words:
+        return ([], False)
+
+    offset = (page - 1) * page_size
+    # Index and memberships are read from the one database memberships are routed to, such as a replica.
+    database = memberships.db
+    memberships = memberships.using(database)
+    search_connection = connections[database]
+
+    if search_connection.vendor == 'sqlite':
+        ids_sql, ids_params = memberships.values('id').query.get_compiler(connection = search_connection).as_sql()
+
+        with search_connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({ids_sql}) '
+                f'ORDER BY rank LIMIT %s OFFSET %s',
+                [' '.join(f'"{word}"*' for word in words), *ids_params, page_size + 1, offset]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+
+        rows_by_id = memberships.in_bulk(ids)
+        rows = [rows_by_id[membership_id] for membership_id in ids if membership_id in rows_by_id]
+    elif search_connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        search_query = SearchQuery(' & '.join(f'{word}:*' for word in words), config = 'simple', search_type = 'raw')
+        memberships = memberships.annotate(search = _search_vector()).filter(search = search_query)
+        memberships = memberships.annotate(rank = SearchRank(F('search'), search_query)).order_by('-rank', 'id')
+        rows = list(memberships[offset:offset + page_size + 1])
+    else:
+        for word in words:
+            memberships = memberships.filter(Q(member_first_name__icontains = word) | Q(member_last_name__icontains = word) | Q(member_bio__icontains = word))
+
+        rows = list(memberships.order_by('id')[offset:offset + page_size + 1])
+
+    return (rows[:page_size], len(rows) > page_size)
@@ -0,0 +1,61 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from faker import Faker
+import random
+
+# Generators of random seed data. They do not use Django, so they can run in worker processes however those are started.
+
+def _faker_and_random(sub_seed):
+    faker = Faker('en_GB')
+    faker.seed_instance(sub_seed)
+    return (faker, random.Random(sub_seed))
+
+def generate_members(sub_seed, count):
+    """Return list of count random fields of memberships, the same for the same sub seed."""
+    faker, rng = _faker_and_random(sub_seed)
+    return [
+        {
+            'member_first_name' : faker.first_name(),
+            'member_last_name' : faker.last_name(),
+            'member_contact_details' : f'+44 {faker.msisdn()[3:]}',
+            'member_personal_statement' : faker.text(max_nb_chars=200),
+            'member_bio' : faker.text(max_nb_chars=500),
+            'member_chess_experience_level' : rng.randint(0,3)
+        }
+        for counter in range(count)
+    ]
+
+def generate_clubs(sub_seed, count):
+    """Return list of count random (first name, location, description) of clubs, the same for the same sub seed."""
+    faker, rng = _faker_and_random(sub_seed)
+    return [(faker.first_name(), faker.address(), faker.text(max_nb_chars=500)) for counter in range(count)]
+
+def generate_batches(generator, base_seed, counts, workers):
+    """
+    Yield, in order, batches made by generator for each count of counts.
+
+    Batch number n is made with sub seed derived from base seed and n, so
+    batches do not depend on the number of workers. With more than one
+    worker, batches are made in a process pool, a few batches ahead of the
+    batch being yielded, so generation overlaps with inserting batches
+    without holding every batch in memory.
+    """
+
+    sub_seeds_and_counts = ((f'{base_seed}:{generator.__name__}:{number}', count) for number, count in enumerate(counts))
+
+    if workers <= 1:
+        for sub_seed, count in sub_seeds_and_counts:
+            yield generator(sub_seed, count)
+        return
+
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        pending = deque()
+
+        for sub_seed, count in sub_seeds_and_counts:
+            pending.append(executor.submit(generator, sub_seed, count))
+
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,111 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from clubs.models import User, Club, Membership, Tournament, Co_oped, Participant, Group, Grouping, TournamentMatch
+from clubs.context_processors import invalidate_club_memberships
+from clubs import club_cache
+from clubs import database
+from clubs import search
+
+@receiver(pre_save, sender = User)
+def user_saving(sender, instance, **kwargs):
+    """Keep gravatar hash of user in line with email, also when loading fixtures."""
+    instance.email_hash = User.hash_email(instance.email)
+
+@receiver(post_save, sender = Membership)
+@receiver(post_delete, sender = Membership)
+def membership_changed(sender, instance, **kwargs):
+    """Drop cached navbar memberships of member of changed membership."""
+    invalidate_club_memberships([instance.member_id])
+
+@receiver(post_save, sender = Membership)
+def membership_saved_search(sender, instance, **kwargs):
+    """Add or update saved membership in member search index."""
+    search.index_membership(instance)
+
+@receiver(post_delete, sender = Membership)
+def membership_deleted_search(sender, instance, **kwargs):
+    """Remove deleted membership from member search index."""
+    search.unindex_membership(instance.id)
+
+@receiver(post_save, sender = Club)
+def club_changed(sender, instance, created, **kwargs):
+    """Drop cached navbar memberships of all members of changed club."""
+    if not created:
+        invalidate_club_memberships(instance.membership_set.values_list('member_id', flat = True))
+
+@receiver(user_logged_in)
+def user_logged_in_changed(sender, user, **kwargs):
+    """Start every session with fresh navbar memberships."""
+    invalidate_club_memberships([user.id])
+
+@receiver(post_save, sender = Participant)
+def participant_created(sender, instance, created, **kwargs):
+    """Increment participant count of tournament of new participant, unless counted in already when its seat was reserved."""
+    if created and not getattr(instance, 'seat_reserved', False):
+        Tournament.objects.filter(id = instance.tournament_id).update(participant_count = F('participant_count') + 1)
+
+@receiver(post_delete, sender = Participant)
+def participant_deleted(sender, instance, **kwargs):
+    """Decrement participant count of tournament of deleted participant."""
+    Tournament.objects.filter(id = instance.tournament_id).update(participant_count = F('participant_count') - 1)
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """Tune new database connection for database profile."""
+    database.configure_connection(connection)
+
+def _tournament_club_id(instance):
+    """Return id of club of tournament of instance, or None if tournament is gone, such as when deleting it."""
+    if type(instance).tournament.is_cached(instance):
+        return instance.tournament.club_id
+
+    return Tournament.objects.filter(id = instance.tournament_id).values_list('club_id', flat = True).first()
+
+@receiver(post_save, sender = Club)
+@receiver(post_delete, sender = Club)
+def club_cache_club_changed(sender, instance, **kwargs):
+    """Bump cache version of changed club."""
+    club_cache.invalidate_club(instance.id)
+
+@receiver(post_save, sender = Membership)
+@receiver(post_delete, sender = Membership)
+@receiver(post_save, sender = Tournament)
+@receiver(post_delete, sender = Tournament)
+def club_cache_club_row_changed(sender, instance, **kwargs):
+    """Bump cache version of club of changed membership or tournament."""
+    club_cache.invalidate_club(instance.club_id)
+
+@receiver(post_save, sender = Co_oped)
+@receiver(post_delete, sender = Co_oped)
+@receiver(post_save, sender = Participant)
+@receiver(post_delete, sender = Participant)
+@receiver(post_save, sender = Group)
+@receiver(post_delete, sender = Group)
+@receiver(post_save, sender = TournamentMatch)
+@receiver(post_delete, sender = TournamentMatch)
+def club_cache_tournament_row_changed(sender, instance, **kwargs):
+    """Bump cache version of club of tournament of changed row."""
+    club_id = _tournament_club_id(instance)
+
+    if club_id is not None:
+        club_cache.invalidate_club(club_id)
+
+@receiver(post_save, sender = Grouping)
+@receiver(post_delete, sender = Grouping)
+def club_cache_grouping_changed(sender, instance, **kwargs):
+    """Bump cache version of club of tournament of group of changed grouping."""
+    club_id = Tournament.objects.filter(group = instance.group_id).values_list('club_id', flat = True).first()
+
+    if club_id is not None:
+        club_cache.invalidate_club(club_id)
+
+@receiver(post_save, sender = User)
+def club_cache_user_changed(sender, instance, created, update_fields, **kwargs):
+    """Bump cache versions of clubs of changed user, whose email and gravatar are shown in them."""
+    # Logging in only updates last login, which clubs do not show.
+    if not (created or (update_fields and (set(update_fields) <= {'last_login'}))):
+        for club_id in Membership.objects.filter(member = instance).values_list('club_id', flat = True):
+            club_cache.invalidate_club(club_id)
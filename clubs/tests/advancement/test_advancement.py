@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from clubs.advancement import advance_tournament
+from clubs.models import Club, Membership, Tournament, Group, Participant, Grouping, TournamentMatch
+from clubs.tests.helpers import create_membership, create_tournament
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+
+class AdvanceTournamentTestCase(TestCase):
+    """Tests of the advancement of tournaments between phases."""
+
+    fixtures = ['clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.club = Club.objects.get(name = 'Test Club')
+        self.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+
+    def _create_tournament(self, total_participants):
+        return create_tournament(self.club, self.organiser, total_participants)
+
+    def _conclude_open_matches(self, tournament):
+        TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = True).update(conclusion = TournamentMatch.ConclusionTypes.DRAW)
+
+    def test_advance_creates_group_stage(self):
+        tournament = self._create_tournament(32)
+        self.assertTrue(advance_tournament(tournament))
+        groups = Group.objects.filter(tournament = tournament, is_active = True)
+        self.assertEqual(groups.count(), 6)
+        self.assertEqual(Grouping.objects.filter(group__tournament = tournament).count(), 32)
+        self.assertEqual(TournamentMatch.objects.filter(tournament = tournament).count(), 5 * 15 + 1)
+
+    def test_advance_eliminates_participants(self):
+        tournament = self._create_tournament(16)
+        advance_tournament(tournament)
+        self._conclude_open_matches(tournament)
+        advance_tournament(tournament)
+        self.assertEqual(Participant.objects.filter(tournament = tournament, eliminated = False).count(), 8)
+        self.assertEqual(Group.objects.filter(tournament = tournament, is_active = True, type = Group.Types.QUARTER_FINAL).count(), 4)
+
+    def test_advance_with_open_matches_does_nothing(self):
+        tournament = self._create_tournament(4)
+        advance_tournament(tournament)
+        self.assertFalse(advance_tournament(tournament))
+        self.assertEqual(Group.objects.filter(tournament = tournament).count(), 2)
+
+    def test_advance_ends_tournament_with_winner(self):
+        tournament = self._create_tournament(2)
+        advance_tournament(tournament)
+        self._conclude_open_matches(tournament)
+        advance_tournament(tournament)
+        tournament.refresh_from_db()
+        self.assertFalse(tournament.is_active)
+        self.assertEqual(Participant.objects.filter(tournament = tournament, won = True).count(), 1)
+
+    def test_advance_takes_bounded_number_of_queries(self):
+        small_tournament = self._create_tournament(32)
+        large_tournament = self._create_tournament(96)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            advance_tournament(small_tournament)
+        with CaptureQueriesContext(connection) as large_queries:
+            advance_tournament(large_tournament)
+
+        # Bulk inserts may be split into a few batches on SQLite, but never one query per row.
+        self.assertLessEqual(len(small_queries), 16)
+        self.assertLessEqual(len(large_queries), 16)
+
+    def test_advance_moves_phase_on(self):
+        tournament = self._create_tournament(4)
+        advance_tournament(tournament)
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.phase, 1)
+
+    def test_repeated_advance_with_stale_tournament_does_nothing(self):
+        tournament = self._create_tournament(4)
+        stale_tournament = Tournament.objects.get(id = tournament.id)
+        self.assertTrue(advance_tournament(tournament))
+        self.assertFalse(advance_tournament(stale_tournament))
+        self.assertEqual(Group.objects.filter(tournament = tournament).count(), 2)
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.phase, 1)
+
+    def test_repeated_advance_is_cheap(self):
+        tournament = self._create_tournament(32)
+        advance_tournament(tournament)
+
+        with CaptureQueriesContext(connection) as queries:
+            advance_tournament(tournament)
+
+        # Only readiness is checked, without writing.
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries.captured_queries[0]['sql'].startswith('SELECT'))
+
+class ConcurrentAdvanceTournamentTestCase(TransactionTestCase):
+    """Tests of concurrent advancement of tournaments on file backed SQLite databases."""
+
+    fixtures = ['clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.club = Club.objects.get(name = 'Test Club')
+        self.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+
+    def _advance_concurrently(self, tournament, threads):
+        """Advance tournament from threads at once, each connected to a file copy of test database, and return results and errors of threads."""
+        results = []
+        errors = []
+        barrier = threading.Barrier(threads, timeout = 30)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'advance.sqlite3'
+            file_connection = sqlite3.connect(path)
+            connection.connection.backup(file_connection)
+            file_connection.close()
+            settings_dict = {**connection.settings_dict, 'NAME' : str(path)}
+
+            def advance():
+                # Connections are per thread, so this thread alone uses the file copy.
+                connections['default'] = DatabaseWrapper(settings_dict, 'default')
+
+                try:
+                    thread_tournament = Tournament.objects.get(id = tournament.id)
+                    barrier.wait()
+                    results.append(advance_tournament(thread_tournament))
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    connections['default'].close()
+
+            workers = [threading.Thread(target = advance) for counter in range(threads)]
+
+            for worker in workers:
+                worker.start()
+
+            for worker in workers:
+                worker.join()
+
+            file_connection = sqlite3.connect(path)
+            group_count = file_connection.execute('SELECT COUNT(*) FROM clubs_group WHERE tournament_id = ?', [tournament.id]).fetchone()[0]
+            file_connection.close()
+
+        return results, errors, group_count
+
+    def test_concurrent_advance_on_file_database_advances_once(self):
+        tournament = create_tournament(self.club, self.organiser, 32)
+
+        for pragmas in ({}, settings.SQLITE_PRODUCTION_PRAGMAS):
+            with self.subTest(pragmas = pragmas), override_settings(SQLITE_PRAGMAS = pragmas):
+                results, errors, group_count = self._advance_concurrently(tournament, 2)
+                self.assertEqual(errors, [])
+                self.assertEqual(sorted(results), [False, True])
+                self.assertEqual(group_count, 6)
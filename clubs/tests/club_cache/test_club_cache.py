@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.core.cache.backends.base import memcache_key_warnings
+from django.test import TestCase
+from clubs import club_cache
+from clubs.models import Club, Membership, TournamentMatch
+from clubs.advancement import advance_tournament
+from clubs.tests.helpers import create_membership, create_tournament
+
+class ClubCacheTestCase(TestCase):
+    """Tests of per club cache versions."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+                'clubs/tests/fixtures/other_clubs.json',
+            ]
+
+    def setUp(self):
+        cache.clear()
+        self.club = Club.objects.get(name = 'Test Club')
+        self.other_club = Club.objects.get(name = 'Test Club 2')
+        self.membership = create_membership(self.club, 'owner@example.org', Membership.MemberTypes.CLUB_OWNER)
+
+    def _assert_bumps_club(self, change, club = None):
+        club = club or self.club
+        version_before = club_cache.get_club_version(club.id)
+        change()
+        self.assertNotEqual(club_cache.get_club_version(club.id), version_before)
+
+    def _create_tournament(self, total_participants):
+        return create_tournament(self.club, self.membership, total_participants)
+
+    def test_get_club_version_is_stable(self):
+        self.assertEqual(club_cache.get_club_version(self.club.id), club_cache.get_club_version(self.club.id))
+
+    def test_cached_entry_is_reused_until_club_changes(self):
+        self.assertEqual(club_cache.get_or_set_club_entry(self.club.id, ['entry'], lambda: 'first'), 'first')
+        self.assertEqual(club_cache.get_or_set_club_entry(self.club.id, ['entry'], lambda: 'second'), 'first')
+        club_cache.invalidate_club(self.club.id)
+        self.assertEqual(club_cache.get_or_set_club_entry(self.club.id, ['entry'], lambda: 'second'), 'second')
+
+    def test_invalidate_club_does_not_change_other_clubs(self):
+        version = club_cache.get_club_version(self.other_club.id)
+        club_cache.invalidate_club(self.club.id)
+        self.assertEqual(club_cache.get_club_version(self.other_club.id), version)
+
+    def test_saving_membership_bumps_club(self):
+        self._assert_bumps_club(lambda: create_membership(self.club, 'new@example.org'))
+
+    def test_deleting_membership_bumps_club(self):
+        membership = create_membership(self.club, 'new@example.org')
+        self._assert_bumps_club(membership.delete)
+
+    def test_saving_club_bumps_club(self):
+        def change():
+            self.club.description = 'New description'
+            self.club.save()
+
+        self._assert_bumps_club(change)
+
+    def test_editing_user_bumps_clubs_of_user(self):
+        def change():
+            self.membership.member.email = 'changed@example.org'
+            self.membership.member.save()
+
+        self._assert_bumps_club(change)
+
+    def test_advancing_tournament_bumps_club(self):
+        tournament = self._create_tournament(4)
+        self._assert_bumps_club(lambda: advance_tournament(tournament))
+
+    def test_setting_match_result_bumps_club(self):
+        tournament = self._create_tournament(2)
+        advance_tournament(tournament)
+        tournament_match = TournamentMatch.objects.get(tournament = tournament)
+
+        def change():
+            tournament_match.conclusion = TournamentMatch.ConclusionTypes.DRAW
+            tournament_match.save()
+
+        self._assert_bumps_club(change)
+
+    def test_evicted_version_is_replaced_with_new_version(self):
+        version = club_cache.get_club_version(self.club.id)
+        cache.delete(club_cache.club_version_key(self.club.id))
+        self.assertNotEqual(club_cache.get_club_version(self.club.id), version)
+
+    def test_club_cache_key_is_valid_for_memcached(self):
+        key = club_cache.club_cache_key(self.club.id, 'member list', 'x' * 300)
+        self.assertEqual(list(memcache_key_warnings(key)), [])
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User, Club, Membership
+from clubs.context_processors import get_club_memberships
+
+class MembershipsContextProcessorTestCase(TestCase):
+    """Tests of the memberships context processor."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.MEMBER
+        )
+        self.url = reverse('user_page')
+
+    def test_memberships_in_context(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['memberships'], [(self.club.id, self.club.name, Membership.MemberTypes.MEMBER)])
+        self.assertContains(response, self.club.name)
+
+    def test_memberships_not_in_context_when_not_logged_in(self):
+        response = self.client.get(reverse('home'))
+        self.assertNotIn('memberships', response.context)
+
+    def test_memberships_are_cached(self):
+        get_club_memberships(self.user.id)
+        with self.assertNumQueries(0):
+            get_club_memberships(self.user.id)
+
+    def test_memberships_invalidated_on_membership_save(self):
+        get_club_memberships(self.user.id)
+        self.membership.member_type = Membership.MemberTypes.OFFICER
+        self.membership.save()
+        self.assertEqual(get_club_memberships(self.user.id), [(self.club.id, self.club.name, Membership.MemberTypes.OFFICER)])
+
+    def test_memberships_invalidated_on_membership_delete(self):
+        get_club_memberships(self.user.id)
+        self.membership.delete()
+        self.assertEqual(get_club_memberships(self.user.id), [])
+
+    def test_memberships_invalidated_on_club_save(self):
+        get_club_memberships(self.user.id)
+        self.club.name = 'Renamed Club'
+        self.club.save()
+        self.assertEqual(get_club_memberships(self.user.id), [(self.club.id, 'Renamed Club', Membership.MemberTypes.MEMBER)])
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import connections
+from django.db.utils import ConnectionHandler
+from django.test import TestCase, override_settings
+from pathlib import Path
+import sqlite3
+import tempfile
+
+class SqlitePragmasTestCase(TestCase):
+    """Tests of pragmas set on new SQLite connections."""
+
+    def _cache_size_of_new_connection(self):
+        connection = connections.create_connection('default')
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA cache_size')
+                return cursor.fetchone()[0]
+        finally:
+            connection.close()
+
+    @override_settings(SQLITE_PRAGMAS = {'cache_size' : -1234, 'busy_timeout' : 5000})
+    def test_pragmas_set_on_new_connection(self):
+        self.assertEqual(self._cache_size_of_new_connection(), -1234)
+
+    @override_settings(SQLITE_PRAGMAS = {})
+    def test_no_pragmas_set_by_default(self):
+        self.assertNotEqual(self._cache_size_of_new_connection(), -1234)
+
+    @override_settings(SQLITE_PRAGMAS = settings.SQLITE_PRODUCTION_PRAGMAS, DATABASE_REPLICAS = ['replica'])
+    def test_read_only_replica_opens_with_production_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'replica.sqlite3'
+            sqlite_connection = sqlite3.connect(path)
+            sqlite_connection.execute('CREATE TABLE example (id INTEGER PRIMARY KEY)')
+            sqlite_connection.close()
+            replica = {
+                'ENGINE' : 'django.db.backends.sqlite3',
+                'NAME' : f'file:{path}?mode=ro',
+                'OPTIONS' : {'uri' : True},
+            }
+            # Connection handlers must define a default database, which is not connected to here.
+            handler = ConnectionHandler({'default' : replica, 'replica' : replica})
+            connection = handler['replica']
+
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM example')
+                    self.assertEqual(cursor.fetchone()[0], 0)
+                    cursor.execute('PRAGMA cache_size')
+                    self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRODUCTION_PRAGMAS['cache_size'])
+            finally:
+                connection.close()
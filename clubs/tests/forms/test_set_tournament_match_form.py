@@ -0,0 +1,58 @@
+from django.test import TestCase
+from clubs.forms import SetTournamentMatchForm
+from clubs.models import Club, Membership, Group, Participant, Grouping, TournamentMatch
+from clubs.tests.helpers import create_membership, create_tournament
+
+class SetTournamentMatchFormTestCase(TestCase):
+    """Unit tests of the set tournament match form."""
+
+    fixtures = ['clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.club = Club.objects.get(name = 'Test Club')
+        organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+        tournament = create_tournament(self.club, organiser, 2)
+        group = Group.objects.create(tournament = tournament, type = Group.Types.FINAL, total_participants_limit = 2)
+        participant1, participant2 = Participant.objects.filter(tournament = tournament).order_by('id')
+        self.player1 = Grouping.objects.create(group = group, participant = participant1)
+        self.player2 = Grouping.objects.create(group = group, participant = participant2)
+        self.tournament_match = TournamentMatch.objects.create(tournament = tournament, group = group, player1 = self.player1, player2 = self.player2)
+
+    def _assert_points(self, player1_points, player2_points):
+        self.player1.refresh_from_db()
+        self.player2.refresh_from_db()
+        self.assertEqual(self.player1.points_in_group, player1_points)
+        self.assertEqual(self.player2.points_in_group, player2_points)
+
+    def test_form_has_necessary_fields(self):
+        form = SetTournamentMatchForm(instance = self.tournament_match)
+        self.assertIn('conclusion', form.fields)
+
+    def test_form_rejects_blank_conclusion(self):
+        form = SetTournamentMatchForm(instance = self.tournament_match, data = {'conclusion' : ''})
+        self.assertFalse(form.is_valid())
+
+    def test_draw_gives_half_point_to_each_player(self):
+        form = SetTournamentMatchForm(instance = self.tournament_match, data = {'conclusion' : TournamentMatch.ConclusionTypes.DRAW})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save(), self.tournament_match)
+        self._assert_points(0.5, 0.5)
+        self.tournament_match.refresh_from_db()
+        self.assertEqual(self.tournament_match.conclusion, TournamentMatch.ConclusionTypes.DRAW)
+
+    def test_player_2_win_gives_point_to_player_2(self):
+        form = SetTournamentMatchForm(instance = self.tournament_match, data = {'conclusion' : TournamentMatch.ConclusionTypes.PLAYER_2_WINS})
+        self.assertTrue(form.is_valid())
+        form.save()
+        self._assert_points(0, 1)
+
+    def test_match_concluded_meanwhile_is_not_scored_twice(self):
+        first_form = SetTournamentMatchForm(instance = TournamentMatch.objects.get(id = self.tournament_match.id), data = {'conclusion' : TournamentMatch.ConclusionTypes.PLAYER_1_WINS})
+        second_form = SetTournamentMatchForm(instance = TournamentMatch.objects.get(id = self.tournament_match.id), data = {'conclusion' : TournamentMatch.ConclusionTypes.PLAYER_2_WINS})
+        self.assertTrue(first_form.is_valid())
+        self.assertTrue(second_form.is_valid())
+        self.assertIsNotNone(first_form.save())
+        self.assertIsNone(second_form.save())
+        self._assert_points(1, 0)
+        self.tournament_match.refresh_from_db()
+        self.assertEqual(self.tournament_match.conclusion, TournamentMatch.ConclusionTypes.PLAYER_1_WINS)
@@ -1,4 +1,7 @@
+from datetime import timedelta
 from django.urls import reverse
+from django.utils import timezone
+from clubs.models import User, Membership, Tournament, Participant
 
 class LogInTester:
     def _is_logged_in(self):
@@ -8,3 +11,34 @@ def reverse_with_next(url_name, next_url):
     url = reverse(url_name)
     url += f"?next={next_url}"
     return url
+
+def create_membership(club, email, member_type = Membership.MemberTypes.MEMBER):
+    """Create user, without usable password, and membership of user to club."""
+    user = User.objects.create(email = email)
+    return Membership.objects.create(
+        club = club,
+        member = user,
+        member_first_name = email.split('@')[0],
+        member_last_name = 'last_name',
+        member_contact_details = '0712345678',
+        member_personal_statement = 'My personal statement',
+        member_bio = 'my bio',
+        member_chess_experience_level = 0,
+        member_type = member_type
+    )
+
+def create_tournament(club, organiser, participant_count = 0, total_participants_limit = None, deadline = None, name = 'Test Tournament'):
+    """Create tournament of club, past its deadline unless given one, with participant count new members as participants."""
+    tournament = Tournament.objects.create(
+        club = club,
+        organiser = organiser,
+        name = name,
+        description = 'A tournament',
+        deadline = deadline or (timezone.now() - timedelta(days = 1)),
+        total_participants_limit = total_participants_limit or max(participant_count, 2)
+    )
+
+    for counter in range(participant_count):
+        Participant.objects.create(tournament = tournament, member = create_membership(club, f'member{tournament.id}_{counter}@example.org'))
+
+    return tournament
@@ -0,0 +1,18 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+class BenchmarkSqliteCommandTestCase(SimpleTestCase):
+    """Tests of the SQLite profile benchmark command."""
+
+    def test_benchmark_reports_both_profiles(self):
+        output = StringIO()
+        call_command('benchmark_sqlite', seconds = 0.2, readers = 1, writers = 1, rows = 100, stdout = output)
+        report = json.loads(output.getvalue())
+
+        for profile in ('default', 'sqlite_production'):
+            self.assertGreater(report[profile]['reads_per_second'], 0)
+            self.assertGreater(report[profile]['writes_per_second'], 0)
+
+        self.assertIn('reads_per_second', report['speedup'])
@@ -0,0 +1,23 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import User, Club
+
+class BenchmarkTournamentCommandTestCase(TestCase):
+    """Tests of the benchmark tournament command."""
+
+    def test_benchmark_plays_tournament_to_winner(self):
+        output = StringIO()
+        call_command('benchmark_tournament', members = 4, no_trace_memory = True, stdout = output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['participants'], 4)
+        self.assertEqual([phase['phase'] for phase in report['phases']], ['join', 'create_matches', 'phase_1', 'phase_2'])
+        self.assertEqual(report['phases'][0]['requests'], 4)
+        self.assertTrue(all(phase['queries'] > 0 for phase in report['phases']))
+        self.assertEqual(report['total']['requests'], sum(phase['requests'] for phase in report['phases']))
+
+    def test_benchmark_removes_what_it_created(self):
+        call_command('benchmark_tournament', members = 2, stdout = StringIO())
+        self.assertFalse(Club.objects.filter(name__startswith = 'Benchmark').exists())
+        self.assertFalse(User.objects.filter(email__startswith = 'benchmark.').exists())
@@ -0,0 +1,25 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.management.commands.explain_queries import is_full_scan
+
+class ExplainQueriesCommandTestCase(TestCase):
+    """Tests of the explain queries command."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json'
+            ]
+
+    def test_hot_queries_use_indexes(self):
+        output = StringIO()
+        call_command('explain_queries', fail_on_scan = True, stdout = output)
+        self.assertIn('open matches of tournament', output.getvalue())
+        self.assertIn('No full table scans.', output.getvalue())
+
+    def test_is_full_scan(self):
+        self.assertTrue(is_full_scan('2 0 0 SCAN clubs_membership'))
+        self.assertTrue(is_full_scan('2 0 0 SCAN TABLE clubs_membership'))
+        self.assertTrue(is_full_scan('Seq Scan on clubs_membership  (cost=0.00..1.01 rows=1 width=4)'))
+        self.assertFalse(is_full_scan('3 0 0 SEARCH clubs_membership USING INDEX membership_club_type_idx (club_id=?)'))
+        self.assertFalse(is_full_scan('2 0 0 SCAN clubs_membership USING COVERING INDEX membership_club_name_idx'))
+        self.assertFalse(is_full_scan('Index Scan using membership_club_type_idx on clubs_membership'))
@@ -0,0 +1,168 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, Max
+from django.test import TestCase
+from clubs import search
+from clubs.advancement import advance_tournament
+from clubs.context_processors import club_memberships_cache_key, get_club_memberships
+from clubs.models import User, Club, Membership, Tournament, Participant, Group, TournamentMatch
+
+class SeedCommandTestCase(TestCase):
+    """Tests of the seed command."""
+
+    def _seed(self, **options):
+        options = {'clubs' : 2, 'members_per_club' : 3, 'officers' : 1, 'applicants' : 1, 'seed' : 1, 'workers' : 1, **options}
+
+        # The seeder reports progress with print.
+        with redirect_stdout(StringIO()):
+            call_command('seed', **options)
+
+    def _seeded_rows(self):
+        return {
+            'clubs' : list(Club.objects.order_by('name').values_list('name', 'location', 'description')),
+            'memberships' : list(Membership.objects.order_by('member__email', 'club__name').values_list(
+                'member__email',
+                'club__name',
+                'member_type',
+                'member_first_name',
+                'member_last_name',
+                'member_contact_details',
+                'member_personal_statement',
+                'member_bio',
+                'member_chess_experience_level'
+            )),
+        }
+
+    def test_seed_creates_memberships_of_each_member_type_per_club(self):
+        self._seed()
+        # The specific clubs are more than the 2 clubs asked for.
+        self.assertEqual(Club.objects.count(), 4)
+
+        for club in Club.objects.all():
+            with self.subTest(club = club.name):
+                memberships = Membership.objects.filter(club = club)
+                self.assertEqual(memberships.filter(member_type = Membership.MemberTypes.CLUB_OWNER).count(), 1)
+                self.assertEqual(memberships.filter(member_type = Membership.MemberTypes.OFFICER).count(), 1)
+                self.assertEqual(memberships.filter(member_type = Membership.MemberTypes.MEMBER).count(), 3)
+                self.assertEqual(memberships.filter(member_type = Membership.MemberTypes.APPLICANT).count(), 1)
+
+    def test_seed_creates_users_who_can_log_in(self):
+        self._seed()
+        self.assertEqual(User.objects.count(), Membership.objects.count() - 3)
+        self.assertTrue(self.client.login(email = 'jeb@example.org', password = 'Password123'))
+
+    def test_seed_indexes_memberships_for_search(self):
+        self._seed()
+        kerbal_memberships = Membership.objects.filter(club__name = 'Kerbal Chess Club')
+        results, has_next = search.search_memberships(kerbal_memberships, 'Jebediah', 10)
+        self.assertEqual([membership.member.email for membership in results], ['jeb@example.org'])
+
+    def test_seed_drops_cached_navbar_memberships(self):
+        jeb_id = (User.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+        cache.set(club_memberships_cache_key(jeb_id), [])
+        self._seed()
+        jeb = User.objects.get(email = 'jeb@example.org')
+        self.assertEqual(jeb.id, jeb_id)
+        self.assertEqual(
+            [(club_name, member_type) for club_id, club_name, member_type in get_club_memberships(jeb.id)],
+            [('Kerbal Chess Club', Membership.MemberTypes.MEMBER), ('Alpha Chess Club', Membership.MemberTypes.OFFICER)]
+        )
+
+    def test_seed_with_same_seed_creates_same_rows(self):
+        seeded_rows = []
+
+        for run in range(2):
+            # Rolled back, ids included, so the second run seeds an identical database.
+            with transaction.atomic():
+                self._seed()
+                seeded_rows.append(self._seeded_rows())
+                transaction.set_rollback(True)
+
+        self.assertEqual(len(seeded_rows[0]['memberships']), 24)
+        self.assertEqual(seeded_rows[0], seeded_rows[1])
+
+    def test_seed_with_same_seed_creates_same_rows_for_any_worker_count(self):
+        seeded_rows = []
+
+        for workers in (1, 2):
+            # Small batches, so batches are generated by processes of the pool in parallel.
+            with transaction.atomic():
+                self._seed(workers = workers, batch_size = 5)
+                seeded_rows.append(self._seeded_rows())
+                transaction.set_rollback(True)
+
+        self.assertEqual(len(seeded_rows[0]['memberships']), 24)
+        self.assertEqual(seeded_rows[0], seeded_rows[1])
+
+class SeedTournamentsCommandTestCase(TestCase):
+    """Tests of tournament histories seeded by the seed command."""
+
+    def setUp(self):
+        # Enough members per club for tournaments in every lifecycle phase, including group stages of 16 or more.
+        with redirect_stdout(StringIO()):
+            call_command('seed', clubs = 4, members_per_club = 24, officers = 2, applicants = 0, tournaments_per_club = 6, seed = 2, workers = 1)
+
+    def _play_to_winner(self, tournament):
+        """Conclude open matches and advance tournament until it ends, and return count of phases it advanced."""
+        advances = 0
+
+        while tournament.is_active:
+            TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = True).update(conclusion = TournamentMatch.ConclusionTypes.PLAYER_1_WINS)
+            self.assertTrue(advance_tournament(tournament))
+            advances += 1
+            self.assertLess(advances, 20)
+
+        return advances
+
+    def test_seed_creates_tournaments_in_every_lifecycle_phase(self):
+        tournaments = Tournament.objects.all()
+        self.assertTrue(tournaments.filter(is_active = True, phase = 0).exists())
+        self.assertTrue(tournaments.filter(is_active = True, group__is_active = True, group__type = Group.Types.GROUP).exists())
+        self.assertTrue(tournaments.filter(is_active = True, group__is_active = True).exclude(group__type = Group.Types.GROUP).exists())
+        self.assertTrue(tournaments.filter(is_active = False).exists())
+
+    def test_seed_counts_participants_of_tournaments(self):
+        for tournament in Tournament.objects.annotate(real_participant_count = Count('participant')):
+            self.assertEqual(tournament.participant_count, tournament.real_participant_count)
+            self.assertLessEqual(tournament.participant_count, tournament.total_participants_limit)
+
+    def test_seed_ends_tournaments_with_one_winner(self):
+        for tournament in Tournament.objects.filter(is_active = False):
+            self.assertEqual(Participant.objects.filter(tournament = tournament, won = True).count(), 1)
+            self.assertFalse(Participant.objects.filter(tournament = tournament, eliminated = False).exists())
+            self.assertFalse(TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = True).exists())
+            self.assertFalse(Group.objects.filter(tournament = tournament, is_active = True).exists())
+
+    def test_seed_leaves_open_matches_only_in_active_groups(self):
+        self.assertTrue(TournamentMatch.objects.filter(tournament__is_active = True, conclusion__isnull = True).exists())
+        self.assertFalse(TournamentMatch.objects.filter(conclusion__isnull = True, group__is_active = False).exists())
+        self.assertFalse(Participant.objects.filter(won = True, tournament__is_active = True).exists())
+
+    def test_seed_creates_round_robin_groups(self):
+        for group in Group.objects.annotate(grouping_count = Count('grouping', distinct = True), match_count = Count('tournamentmatch', distinct = True)):
+            self.assertLessEqual(group.grouping_count, group.total_participants_limit)
+            self.assertEqual(group.match_count, group.grouping_count * (group.grouping_count - 1) // 2)
+
+    def test_seed_moves_phase_on_of_tournaments_with_groups(self):
+        for tournament in Tournament.objects.filter(group__isnull = True):
+            self.assertEqual(tournament.phase, 0)
+
+        for tournament in Tournament.objects.filter(group__isnull = False).distinct():
+            self.assertGreater(tournament.phase, 0)
+
+    def test_seeded_tournaments_in_progress_can_be_played_to_winner(self):
+        tournaments_in_progress = Tournament.objects.filter(is_active = True, group__is_active = True).distinct()
+        self.assertTrue(tournaments_in_progress.exists())
+
+        for tournament in tournaments_in_progress:
+            remaining_ids = set(Participant.objects.filter(tournament = tournament, eliminated = False).values_list('id', flat = True))
+            phase = tournament.phase
+            advances = self._play_to_winner(tournament)
+            tournament.refresh_from_db()
+            self.assertEqual(tournament.phase, phase + advances)
+            winners = Participant.objects.filter(tournament = tournament, won = True)
+            self.assertEqual(winners.count(), 1)
+            self.assertIn(winners.get().id, remaining_ids)
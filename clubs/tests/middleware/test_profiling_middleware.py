@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+from pathlib import Path
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User
+
+class ProfilingMiddlewareTestCase(TestCase):
+    """Tests of the profiling middleware."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.profiling_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.profiling_dir)
+        self.settings_override = override_settings(PROFILING_DIR = self.profiling_dir)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.url = reverse('user_page')
+        self.client.force_login(self.user)
+
+    def _profiles(self):
+        return sorted(self.profiling_dir.glob('*.prof'))
+
+    @override_settings(PROFILING_SAMPLE_RATE = 2)
+    def test_profiles_one_in_sample_rate_requests(self):
+        for counter in range(4):
+            self.client.get(self.url)
+
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertTrue(profiles[0].name.endswith('-user_page.prof'))
+        summary = profiles[0].with_suffix('.txt').read_text()
+        self.assertTrue(summary.startswith('GET /user_page/'))
+        self.assertIn('cumulative', summary)
+
+    def test_profiles_staff_request_with_header(self):
+        self.user.is_admin = True
+        self.user.save()
+        self.client.get(self.url)
+        self.assertEqual(len(self._profiles()), 0)
+        self.client.get(self.url, HTTP_X_PROFILE = '1')
+        self.assertEqual(len(self._profiles()), 1)
+
+    def test_does_not_profile_non_staff_request_with_header(self):
+        self.client.get(self.url, HTTP_X_PROFILE = '1')
+        self.assertEqual(len(self._profiles()), 0)
+
+    @override_settings(PROFILING_SAMPLE_RATE = 1, PROFILING_MAX_FILES = 2)
+    def test_keeps_latest_profiles(self):
+        for counter in range(4):
+            self.client.get(self.url)
+
+        self.assertEqual(len(self._profiles()), 2)
+        self.assertEqual(len(list(self.profiling_dir.glob('*.txt'))), 2)
+
+    @override_settings(PROFILING_SAMPLE_RATE = 0, PROFILING_HEADER = None)
+    def test_not_used_when_disabled(self):
+        self.user.is_admin = True
+        self.user.save()
+        self.client.get(self.url, HTTP_X_PROFILE = '1')
+        self.assertEqual(len(self._profiles()), 0)
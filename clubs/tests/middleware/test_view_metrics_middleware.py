@@ -0,0 +1,45 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs import metrics
+from clubs.models import User
+
+class ViewMetricsMiddlewareTestCase(TestCase):
+    """Tests of the view metrics middleware."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        metrics.registry.reset()
+
+    def test_records_metrics_per_url_name(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('user_page'))
+        self.client.get(reverse('user_page'))
+        self.assertEqual(metrics.registry.get_histogram('user_page', 'wall_time_seconds').count, 2)
+        self.assertGreater(metrics.registry.get_histogram('user_page', 'queries').sum, 0)
+        self.assertGreater(metrics.registry.get_histogram('user_page', 'db_time_seconds').sum, 0)
+        self.assertGreater(metrics.registry.get_histogram('user_page', 'template_time_seconds').sum, 0)
+
+    def test_records_unresolved_requests(self):
+        self.client.get('/no_such_page/')
+        self.assertEqual(metrics.registry.get_histogram('unresolved', 'queries').count, 1)
+
+    @override_settings(VIEW_BUDGETS = {'user_page' : {'queries' : 0}})
+    def test_logs_warning_when_budget_exceeded(self):
+        self.client.force_login(self.user)
+
+        with self.assertLogs('clubs.middleware', level = 'WARNING') as logs:
+            self.client.get(reverse('user_page'))
+
+        self.assertIn('View user_page exceeded budget of queries', logs.output[0])
+
+    def test_histogram_buckets(self):
+        histogram = metrics.Histogram((1, 10))
+
+        for value in (0, 1, 5, 10, 11):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.bucket_counts, [2, 2, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.sum, 27)
@@ -0,0 +1,52 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from clubs.models import Club, Membership, Participant
+from clubs.tests.helpers import create_membership, create_tournament
+
+class TournamentModelTestCase(TestCase):
+
+    fixtures = [
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        self.club = Club.objects.get(name = 'Test Club')
+        self.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+        self.tournament = create_tournament(self.club, self.organiser, deadline = timezone.now() + timedelta(days = 1))
+        self.member1 = create_membership(self.club, 'member1@example.org')
+        self.member2 = create_membership(self.club, 'member2@example.org')
+
+    def test_participant_count_starts_at_zero(self):
+        self.assertEqual(self.tournament.total_participants(), 0)
+        self.assertFalse(self.tournament.is_full())
+
+    def test_participant_count_increments_on_participant_create(self):
+        Participant.objects.create(tournament = self.tournament, member = self.member1)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.total_participants(), 1)
+
+    def test_participant_count_does_not_increment_on_participant_update(self):
+        participant = Participant.objects.create(tournament = self.tournament, member = self.member1)
+        participant.eliminated = True
+        participant.save()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.total_participants(), 1)
+
+    def test_participant_count_decrements_on_participant_delete(self):
+        participant = Participant.objects.create(tournament = self.tournament, member = self.member1)
+        participant.delete()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.total_participants(), 0)
+
+    def test_participant_count_decrements_on_membership_delete(self):
+        Participant.objects.create(tournament = self.tournament, member = self.member1)
+        self.member1.delete()
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.total_participants(), 0)
+
+    def test_is_full_when_limit_reached(self):
+        Participant.objects.create(tournament = self.tournament, member = self.member1)
+        Participant.objects.create(tournament = self.tournament, member = self.member2)
+        self.tournament.refresh_from_db()
+        self.assertTrue(self.tournament.is_full())
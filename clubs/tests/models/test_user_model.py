@@ -44,6 +44,17 @@ class UserModelTestCase(TestCase):
         self.user.email = 'teat1@@example.org'
         self._assert_user_is_invalid()
 
+    def test_gravatar_uses_hash_of_normalised_email(self):
+        self.assertEqual(self.user.email_hash, '9a95d1e78d4ed9b1a372efb0f331ab99')
+        self.assertEqual(self.user.gravatar(), 'https://www.gravatar.com/avatar/9a95d1e78d4ed9b1a372efb0f331ab99?size=120&default=mp')
+        self.assertEqual(self.user.mini_gravatar(), 'https://www.gravatar.com/avatar/9a95d1e78d4ed9b1a372efb0f331ab99?size=60&default=mp')
+
+    def test_email_hash_updated_on_save(self):
+        self.user.email = ' Test3@Example.org'
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email_hash, User.hash_email('test3@example.org'))
+
     def _assert_user_is_valid(self):
         try:
             self.user.full_clean()
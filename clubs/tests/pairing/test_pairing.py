@@ -0,0 +1,73 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from clubs.models import Club, Membership, Group, Participant, Grouping, TournamentMatch
+from clubs.pairing import pair_key, pair_participants, group_type_and_size, load_head_to_head, create_groups
+from clubs.tests.helpers import create_membership, create_tournament
+
+class PairParticipantsTestCase(TestCase):
+    """Tests of the in memory pairing of participants."""
+
+    def test_group_type_and_size(self):
+        self.assertEqual(group_type_and_size(96), (Group.Types.GROUP, 6))
+        self.assertEqual(group_type_and_size(32), (Group.Types.GROUP, 6))
+        self.assertEqual(group_type_and_size(16), (Group.Types.GROUP, 4))
+        self.assertEqual(group_type_and_size(8), (Group.Types.QUARTER_FINAL, 2))
+        self.assertEqual(group_type_and_size(4), (Group.Types.SEMI_FINAL, 2))
+        self.assertEqual(group_type_and_size(2), (Group.Types.FINAL, 2))
+        self.assertEqual(group_type_and_size(1), (None, None))
+
+    def test_pair_participants_without_history(self):
+        groups = pair_participants([1, 2, 3, 4, 5, 6, 7, 8], 4, defaultdict(int))
+        self.assertEqual(groups, [[2, 3, 4, 1], [6, 7, 8, 5]])
+
+    def test_pair_participants_avoids_previous_opponents(self):
+        head_to_head = defaultdict(int)
+        head_to_head[pair_key(1, 2)] = 1
+        head_to_head[pair_key(3, 4)] = 1
+        groups = pair_participants([1, 2, 3, 4], 2, head_to_head)
+        self.assertEqual(groups, [[3, 1], [4, 2]])
+
+    def test_pair_participants_pairs_least_faced_when_all_faced(self):
+        head_to_head = defaultdict(int)
+        head_to_head[pair_key(1, 2)] = 2
+        head_to_head[pair_key(1, 3)] = 1
+        groups = pair_participants([1, 2, 3], 2, head_to_head)
+        self.assertEqual(groups, [[3, 1]])
+
+    def test_pair_participants_with_short_last_group(self):
+        groups = pair_participants([1, 2, 3, 4, 5, 6, 7, 8], 6, defaultdict(int))
+        self.assertEqual(groups, [[2, 3, 4, 5, 6, 1], [8, 7]])
+
+class CreateGroupsTestCase(TestCase):
+    """Tests of the creation of groups and groupings."""
+
+    fixtures = ['clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.club = Club.objects.get(name = 'Test Club')
+        organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+        self.tournament = create_tournament(self.club, organiser, 16, deadline = timezone.now() + timedelta(days = 1))
+        self.participants = list(Participant.objects.filter(tournament = self.tournament).order_by('id'))
+
+    def test_create_groups(self):
+        participant_ids = [participant.id for participant in self.participants]
+        with self.assertNumQueries(4):
+            groups = create_groups(self.tournament, participant_ids)
+        self.assertEqual(len(groups), 4)
+        self.assertEqual([group.number for group in groups], [1, 2, 3, 4])
+        self.assertEqual(Grouping.objects.filter(group__tournament = self.tournament).count(), 16)
+
+        for group in groups:
+            self.assertEqual(group.type, Group.Types.GROUP)
+            self.assertEqual(group.grouping_set.count(), 4)
+
+    def test_load_head_to_head(self):
+        group = Group.objects.create(tournament = self.tournament, type = Group.Types.FINAL, total_participants_limit = 2)
+        player1 = Grouping.objects.create(group = group, participant = self.participants[0])
+        player2 = Grouping.objects.create(group = group, participant = self.participants[1])
+        TournamentMatch.objects.create(tournament = self.tournament, group = group, player1 = player1, player2 = player2, conclusion = TournamentMatch.ConclusionTypes.DRAW)
+        head_to_head = load_head_to_head(self.tournament)
+        self.assertEqual(head_to_head[pair_key(self.participants[1].id, self.participants[0].id)], 1)
+        self.assertEqual(head_to_head[pair_key(self.participants[0].id, self.participants[2].id)], 0)
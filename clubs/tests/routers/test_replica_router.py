@@ -0,0 +1,121 @@
+import time
+from unittest import mock
+from django.contrib.sessions.models import Session
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from clubs import routers, search
+from clubs.middleware import ReplicaRoutingMiddleware
+from clubs.models import Membership
+
+@override_settings(DATABASE_REPLICAS = ['replica'], REPLICA_PIN_SECONDS = 5)
+class ReplicaRouterTestCase(SimpleTestCase):
+    """Tests of the replica router and the replica routing middleware."""
+
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def _handle(self, request, view):
+        request.session = getattr(request, 'session', {})
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_reads_outside_requests_go_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Membership), 'default')
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Membership), 'default')
+
+    def test_reads_of_safe_request_go_to_replica(self):
+        databases = []
+        self._handle(self.factory.get('/'), lambda request: databases.append(self.router.db_for_read(Membership)))
+        self.assertEqual(databases, ['replica'])
+
+    @override_settings(DATABASE_REPLICAS = [])
+    def test_reads_go_to_primary_without_replicas(self):
+        databases = []
+        self._handle(self.factory.get('/'), lambda request: databases.append(self.router.db_for_read(Membership)))
+        self.assertEqual(databases, ['default'])
+
+    def test_reads_of_sessions_go_to_primary(self):
+        databases = []
+        self._handle(self.factory.get('/'), lambda request: databases.append(self.router.db_for_read(Session)))
+        self.assertEqual(databases, ['default'])
+
+    def test_reads_of_database_cache_go_to_primary(self):
+        databases = []
+        cache_model = DatabaseCache('django_cache', {}).cache_model_class
+        self._handle(self.factory.get('/'), lambda request: databases.append(self.router.db_for_read(cache_model)))
+        self.assertEqual(databases, ['default'])
+
+    def test_reads_of_unsafe_request_go_to_primary(self):
+        databases = []
+        self._handle(self.factory.post('/'), lambda request: databases.append(self.router.db_for_read(Membership)))
+        self.assertEqual(databases, ['default'])
+
+    def test_reads_after_write_in_request_go_to_primary(self):
+        databases = []
+
+        def view(request):
+            databases.append(self.router.db_for_read(Membership))
+            self.router.db_for_write(Membership)
+            databases.append(self.router.db_for_read(Membership))
+
+        self._handle(self.factory.get('/'), view)
+        self.assertEqual(databases, ['replica', 'default'])
+
+    def test_write_pins_session_to_primary(self):
+        request = self.factory.post('/')
+        request.session = {}
+        self._handle(request, lambda request: self.router.db_for_write(Membership))
+        self.assertGreater(request.session[ReplicaRoutingMiddleware.SESSION_KEY], time.time())
+        databases = []
+        next_request = self.factory.get('/')
+        next_request.session = request.session
+        self._handle(next_request, lambda request: databases.append(self.router.db_for_read(Membership)))
+        self.assertEqual(databases, ['default'])
+
+    def test_expired_pin_reads_go_to_replica(self):
+        request = self.factory.get('/')
+        request.session = {ReplicaRoutingMiddleware.SESSION_KEY : time.time() - 1}
+        databases = []
+        self._handle(request, lambda request: databases.append(self.router.db_for_read(Membership)))
+        self.assertEqual(databases, ['replica'])
+
+    def test_request_without_write_does_not_pin_session(self):
+        request = self.factory.get('/')
+        request.session = {}
+        self._handle(request, lambda request: self.router.db_for_read(Membership))
+        self.assertNotIn(ReplicaRoutingMiddleware.SESSION_KEY, request.session)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'clubs'))
+        self.assertIsNone(self.router.allow_migrate('default', 'clubs'))
+
+class AliasRecordingConnections(dict):
+    """Connections of aliases, recording aliases asked for."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.aliases = []
+
+    def __getitem__(self, alias):
+        self.aliases.append(alias)
+        return super().__getitem__(alias)
+
+@override_settings(DATABASE_REPLICAS = ['replica'])
+class SearchRoutingTestCase(TestCase):
+    """Tests of routing of member search."""
+
+    def test_search_reads_index_from_database_memberships_are_routed_to(self):
+        # The test database stands in for the replica, which is not configured in tests.
+        recording_connections = AliasRecordingConnections(replica = connections['default'])
+        request = RequestFactory().get('/')
+        request.session = {}
+
+        # Tests run in a transaction, whose reads the router would otherwise keep on primary.
+        with mock.patch('clubs.search.connections', recording_connections), mock.patch('clubs.routers.connections', {'default' : mock.Mock(in_atomic_block = False)}):
+            results = ReplicaRoutingMiddleware(lambda request: search.search_memberships(Membership.objects.all(), 'nobody', 10))(request)
+
+        self.assertEqual(results, ([], False))
+        self.assertEqual(recording_connections.aliases, ['replica'])
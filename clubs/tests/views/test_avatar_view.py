@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.avatars import avatar_etag, get_avatar_path
+from clubs.models import User
+from clubs.tests.helpers import reverse_with_next
+from pathlib import Path
+
+EMAIL_HASH = '9a95d1e78d4ed9b1a372efb0f331ab99'
+
+class AvatarViewTestCase(TestCase):
+    """Tests of the avatar view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.avatar_cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.avatar_cache_dir)
+        self.settings_override = override_settings(AVATAR_CACHE_DIR = self.avatar_cache_dir)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.url = reverse('avatar', kwargs = {'email_hash' : EMAIL_HASH, 'size' : 60})
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+
+    def test_avatar_url(self):
+        self.assertEqual(self.url, f'/avatar/{EMAIL_HASH}/60/')
+
+    def test_get_avatar(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['ETag'], avatar_etag(EMAIL_HASH, 60))
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'\x89PNG\r\n\x1a\n'))
+
+    def test_get_avatar_reuses_cached_image(self):
+        self.client.get(self.url)
+        path = get_avatar_path(EMAIL_HASH, 60)
+        modified = path.stat().st_mtime_ns
+        response = self.client.get(self.url)
+        b''.join(response.streaming_content)
+        self.assertEqual(path.stat().st_mtime_ns, modified)
+
+    def test_get_avatar_with_matching_etag(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH = avatar_etag(EMAIL_HASH, 60))
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_get_avatar_when_not_logged_in_redirects(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse_with_next('log_in', self.url), status_code = 302, target_status_code = 200)
+
+    def test_get_avatar_of_deleted_user_with_matching_etag(self):
+        User.objects.get(email = 'test1@example.org').delete()
+        self.client.force_login(User.objects.create(email = 'other@example.org'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH = avatar_etag(EMAIL_HASH, 60))
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_avatar_of_unknown_email_hash_with_matching_etag(self):
+        unknown_email_hash = '0' * 32
+        url = reverse('avatar', kwargs = {'email_hash' : unknown_email_hash, 'size' : 60})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH = avatar_etag(unknown_email_hash, 60))
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_avatar_with_invalid_size(self):
+        response = self.client.get(reverse('avatar', kwargs = {'email_hash' : EMAIL_HASH, 'size' : 61}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_avatar_with_invalid_email_hash(self):
+        response = self.client.get(reverse('avatar', kwargs = {'email_hash' : EMAIL_HASH.upper(), 'size' : 60}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_avatar_of_unknown_email_hash_writes_no_file(self):
+        unknown_email_hash = '0' * 32
+        response = self.client.get(reverse('avatar', kwargs = {'email_hash' : unknown_email_hash, 'size' : 60}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(list(Path(self.avatar_cache_dir).rglob('*.png')), [])
+
+    @override_settings(USE_LOCAL_AVATARS = True)
+    def test_gravatar_uses_local_avatar(self):
+        user = User.objects.get(email = 'test1@example.org')
+        self.assertEqual(user.gravatar(), reverse('avatar', kwargs = {'email_hash' : EMAIL_HASH, 'size' : 120}))
+        self.assertEqual(user.mini_gravatar(), self.url)
@@ -1,7 +1,11 @@
-from clubs.models import User,Club, Membership
+from datetime import timedelta
+from clubs import club_cache
+from clubs.models import User,Club, Membership, Tournament, Participant
+from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
-from clubs.tests.helpers import LogInTester,reverse_with_next
+from django.utils import timezone
+from clubs.tests.helpers import LogInTester,reverse_with_next, create_membership
 
 class ClubPageViewTestCase(TestCase,LogInTester):
     """Tests of the club page view."""
@@ -9,6 +13,7 @@ class ClubPageViewTestCase(TestCase,LogInTester):
     fixtures = ['clubs/tests/fixtures/default_user.json',
                 'clubs/tests/fixtures/default_club.json',
                 'clubs/tests/fixtures/other_users.json',
+                'clubs/tests/fixtures/other_clubs.json',
             ]
 
     def setUp(self):
@@ -87,3 +92,104 @@ class ClubPageViewTestCase(TestCase,LogInTester):
         self.assertContains(response,membership.member_bio)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'club_page.html')
+
+    def _create_ended_tournament(self, club, name):
+        organiser = Membership.objects.get(club = self.club, member_type = 3) if club == self.club else create_membership(club, f'organiser_{name}@example.org', 3)
+        tournament = Tournament.objects.create(
+            club = club,
+            organiser = organiser,
+            name = name,
+            description = 'A tournament',
+            deadline = timezone.now() - timedelta(days = 1),
+            total_participants_limit = 2,
+            is_active = False
+        )
+        winner = create_membership(club, f'winner_{name}@example.org')
+        Participant.objects.create(tournament = tournament, member = winner, won = True, eliminated = True)
+        Participant.objects.create(tournament = tournament, member = create_membership(club, f'loser_{name}@example.org'), eliminated = True)
+        return winner
+
+    def _log_in_as_member(self):
+        self.client.login(email = 'test1@example.org', password='Password123')
+        Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = 1
+        )
+
+    def test_get_club_page_shows_winners_of_club_only(self):
+        self._log_in_as_member()
+        winner = self._create_ended_tournament(self.club, 'Club tournament')
+        self._create_ended_tournament(Club.objects.exclude(id = self.club.id).first(), 'Other club tournament')
+        response = self.client.get(self.url)
+        self.assertEqual(list(response.context['winners']), [Participant.objects.get(member = winner)])
+        self.assertContains(response, 'Club tournament')
+        self.assertContains(response, winner.member_full_name())
+        self.assertNotContains(response, 'Other club tournament')
+
+    def test_get_club_page_paginates_winners(self):
+        self._log_in_as_member()
+
+        for counter in range(settings.WINNERS_PER_PAGE + 1):
+            self._create_ended_tournament(self.club, f'Tournament {counter}')
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['winners']), settings.WINNERS_PER_PAGE)
+        response = self.client.get(self.url, {'page' : 2})
+        self.assertEqual(len(response.context['winners']), 1)
+
+    def test_get_club_page_queries_do_not_grow_with_winners(self):
+        self._log_in_as_member()
+        self.client.get(self.url)
+        self._create_ended_tournament(self.club, 'First tournament')
+
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+        for counter in range(5):
+            self._create_ended_tournament(self.club, f'Tournament {counter}')
+
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+    def test_get_club_page_caches_club_until_it_changes(self):
+        self._log_in_as_member()
+        self._create_ended_tournament(self.club, 'First tournament')
+        self.client.get(self.url)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        self.assertContains(response, 'First tournament')
+        self._create_ended_tournament(self.club, 'Second tournament')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Second tournament')
+
+    def test_get_club_page_reuses_rendered_winners_until_club_changes(self):
+        self._log_in_as_member()
+        self._create_ended_tournament(self.club, 'First tournament')
+        self.client.get(self.url)
+        # Updates send no signals, so the club is not invalidated.
+        Tournament.objects.filter(name = 'First tournament').update(name = 'Renamed tournament')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'First tournament')
+        club_cache.invalidate_club(self.club.id)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Renamed tournament')
+
+    def test_get_club_page_with_invalid_page_shares_cache_of_first_page(self):
+        self._log_in_as_member()
+        self._create_ended_tournament(self.club, 'First tournament')
+        self.client.get(self.url, {'page' : 1})
+
+        for page in ['abc', '0', '999']:
+            with self.assertNumQueries(3):
+                response = self.client.get(self.url, {'page' : page})
+
+            self.assertContains(response, 'First tournament')
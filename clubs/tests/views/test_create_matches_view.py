@@ -0,0 +1,78 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import User, Club, Membership, Group, Participant, TournamentMatch
+from clubs.tests.helpers import LogInTester, create_membership, create_tournament
+
+class CreateMatchesViewTestCase(TestCase, LogInTester):
+    """Tests of the create matches view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.CLUB_OWNER
+        )
+        self.tournament = create_tournament(self.club, self.membership, 4)
+        self.url = reverse('create_matches', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+        self.tournament_page_url = reverse('tournament_page', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+
+    def _conclude_open_matches(self):
+        for tournament_match in TournamentMatch.objects.filter(tournament = self.tournament, conclusion__isnull = True):
+            url = reverse('set_tournament_match', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id, 'tournament_match_id' : tournament_match.id})
+            self.client.post(url, {'conclusion' : TournamentMatch.ConclusionTypes.PLAYER_1_WINS}, follow = True)
+
+    def test_create_matches_url(self):
+        self.assertEqual(self.url, f'/create_matches/{self.club.id}/{self.tournament.id}/')
+
+    def test_create_matches_creates_semi_finals(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, self.tournament_page_url, status_code = 302, target_status_code = 200)
+        groups = Group.objects.filter(tournament = self.tournament, is_active = True)
+        self.assertEqual(groups.count(), 2)
+
+        for group in groups:
+            self.assertEqual(group.type, Group.Types.SEMI_FINAL)
+            self.assertEqual(group.grouping_set.count(), 2)
+            self.assertEqual(group.tournamentmatch_set.count(), 1)
+
+    def test_create_matches_before_deadline_does_nothing(self):
+        self.tournament.deadline = timezone.now() + timedelta(days = 1)
+        self.tournament.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.client.get(self.url)
+        self.assertFalse(Group.objects.filter(tournament = self.tournament).exists())
+
+    def test_create_matches_as_participant_does_nothing(self):
+        self.tournament.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+        self.tournament.save()
+        Participant.objects.create(tournament = self.tournament, member = self.membership)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.client.get(self.url)
+        self.assertFalse(Group.objects.filter(tournament = self.tournament).exists())
+
+    def test_tournament_played_to_winner(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.client.get(self.url)
+        self._conclude_open_matches()
+        final = Group.objects.get(tournament = self.tournament, is_active = True)
+        self.assertEqual(final.type, Group.Types.FINAL)
+        self.assertEqual(Participant.objects.filter(tournament = self.tournament, eliminated = False).count(), 2)
+        self._conclude_open_matches()
+        self.tournament.refresh_from_db()
+        self.assertFalse(self.tournament.is_active)
+        self.assertEqual(Participant.objects.filter(tournament = self.tournament, won = True).count(), 1)
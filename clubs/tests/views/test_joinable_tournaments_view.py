@@ -0,0 +1,60 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import User, Club, Membership, Participant, Co_oped
+from clubs.tests.helpers import LogInTester, create_membership, create_tournament
+
+class JoinableTournamentsViewTestCase(TestCase, LogInTester):
+    """Tests of the joinable tournaments view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.OFFICER
+        )
+        self.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.CLUB_OWNER)
+        self.url = reverse('joinable_tournaments', kwargs = {'club_id' : self.club.id})
+
+    def _create_tournament(self, name, deadline = None, total_participants_limit = 2):
+        return create_tournament(self.club, self.organiser, total_participants_limit = total_participants_limit, deadline = deadline or (timezone.now() + timedelta(days = 1)), name = name)
+
+    def test_joinable_tournaments_url(self):
+        self.assertEqual(self.url, f'/joinable_tournaments/{self.club.id}/')
+
+    def test_get_joinable_tournaments(self):
+        open_tournament = self._create_tournament('Open')
+        self._create_tournament('Passed deadline', deadline = timezone.now() - timedelta(days = 1))
+        full_tournament = self._create_tournament('Full')
+        Participant.objects.create(tournament = full_tournament, member = create_membership(self.club, 'p1@example.org'))
+        Participant.objects.create(tournament = full_tournament, member = create_membership(self.club, 'p2@example.org'))
+        joined_tournament = self._create_tournament('Joined')
+        Participant.objects.create(tournament = joined_tournament, member = self.membership)
+        co_oped_tournament = self._create_tournament('Co-organised')
+        Co_oped.objects.create(tournament = co_oped_tournament, co_organiser = self.membership)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'joinable_tournaments.html')
+        self.assertEqual(list(response.context['tournaments']), [open_tournament])
+
+    def test_get_joinable_tournaments_as_applicant_redirects(self):
+        self.membership.member_type = Membership.MemberTypes.APPLICANT
+        self.membership.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        redirect_url = reverse('club_page', kwargs = {'club_id' : self.club.id})
+        self.assertRedirects(response, redirect_url, status_code = 302, target_status_code = 200)
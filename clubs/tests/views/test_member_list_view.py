@@ -1,7 +1,10 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from clubs import club_cache
 from clubs.models import User, Club, Membership
-from clubs.tests.helpers import LogInTester, reverse_with_next
+from clubs.tests.helpers import LogInTester, reverse_with_next, create_membership
 
 class MemberListViewTestCase(TestCase,LogInTester):
     """Tests of the member list view."""
@@ -87,3 +90,76 @@ class MemberListViewTestCase(TestCase,LogInTester):
         response_url = reverse('user_page')
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'user_page.html')
+
+    def _create_officer_membership(self):
+        Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'officer',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.OFFICER
+        )
+
+    @override_settings(MEMBERS_PER_PAGE = 2)
+    def test_get_member_list_in_pages(self):
+        self.client.login(email = 'test1@example.org', password='Password123')
+        self._create_officer_membership()
+
+        for name in ['d', 'b', 'a', 'c']:
+            create_membership(self.club, f'{name}@example.org')
+
+        response = self.client.get(self.url)
+        first_page = [entry.member_first_name for entry in response.context['membership_list']]
+        self.assertIsNone(response.context['previous_cursor'])
+        response = self.client.get(self.url, {'after' : response.context['next_cursor']})
+        second_page = [entry.member_first_name for entry in response.context['membership_list']]
+        response = self.client.get(self.url, {'after' : response.context['next_cursor']})
+        third_page = [entry.member_first_name for entry in response.context['membership_list']]
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertEqual(first_page + second_page + third_page, ['a', 'b', 'c', 'd', 'first_name1', 'officer'])
+        response = self.client.get(self.url, {'before' : response.context['previous_cursor']})
+        self.assertEqual([entry.member_first_name for entry in response.context['membership_list']], second_page)
+
+    def test_get_member_list_with_invalid_cursor_shows_first_page(self):
+        self.client.login(email = 'test1@example.org', password='Password123')
+        self._create_officer_membership()
+        response = self.client.get(self.url, {'after' : 'invalid'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['previous_cursor'])
+
+    def test_get_member_list_reuses_rendered_rows_until_club_changes(self):
+        self.client.login(email = 'test2@example.org', password='Password123')
+        self.client.get(self.url)
+        # Updates send no signals, so the club is not invalidated.
+        Membership.objects.filter(id = self.membership.id).update(member_bio = 'changed bio')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'my bio')
+        self.assertNotContains(response, 'changed bio')
+        club_cache.invalidate_club(self.club.id)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'changed bio')
+
+    def test_get_member_list_does_not_share_rendered_rows_of_members_with_officers(self):
+        self._create_officer_membership()
+        self.client.login(email = 'test2@example.org', password='Password123')
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'officer')
+        self.client.login(email = 'test1@example.org', password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'officer')
+
+    def test_get_member_list_with_invalid_cursor_shares_cache_of_first_page(self):
+        self.client.login(email = 'test2@example.org', password='Password123')
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as first_page_queries:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as invalid_cursor_queries:
+            response = self.client.get(self.url, {'after' : 'invalid', 'before' : 'also invalid'})
+
+        self.assertEqual(len(invalid_cursor_queries), len(first_page_queries))
+        self.assertContains(response, 'first_name1')
@@ -0,0 +1,107 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User, Club, Membership
+from clubs.tests.helpers import LogInTester, reverse_with_next, create_membership
+
+class MemberSearchViewTestCase(TestCase, LogInTester):
+    """Tests of the member search view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json'
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.OFFICER
+        )
+        self.url = reverse('member_search', kwargs = {'club_id' : self.club.id})
+
+    def _search(self, query, **kwargs):
+        response = self.client.get(self.url, {'q' : query, **kwargs})
+        return [entry.member_first_name for entry in response.context['membership_list']]
+
+    def test_member_search_url(self):
+        self.assertEqual(self.url, f'/member_search/{self.club.id}/')
+
+    def test_get_member_search_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code = 302, target_status_code = 200)
+
+    def test_search_matches_names_and_bio_as_prefixes(self):
+        magnus = create_membership(self.club, 'magnus@example.org')
+        magnus.member_last_name = 'Carlsen'
+        magnus.save()
+        judit = create_membership(self.club, 'judit@example.org')
+        judit.member_bio = 'Plays the Sicilian defence'
+        judit.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url, {'q' : 'carl'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'member_search.html')
+        self.assertEqual([entry.member_first_name for entry in response.context['membership_list']], ['magnus'])
+        self.assertEqual(self._search('sicil'), ['judit'])
+        self.assertEqual(self._search('magnus carl'), ['magnus'])
+        self.assertEqual(self._search('magnus sicil'), [])
+
+    def test_search_ranks_better_matches_first(self):
+        once = create_membership(self.club, 'once@example.org')
+        once.member_bio = 'endgame'
+        once.save()
+        twice = create_membership(self.club, 'twice@example.org')
+        twice.member_bio = 'endgame endgame endgame'
+        twice.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.assertEqual(self._search('endgame'), ['twice', 'once'])
+
+    def test_search_ignores_full_text_syntax(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.assertEqual(self._search('first_name1 "*'), ['first_name1'])
+        self.assertEqual(self._search('first_name1 OR'), [])
+        self.assertEqual(self._search('"'), [])
+
+    def test_search_does_not_find_deleted_membership(self):
+        deleted = create_membership(self.club, 'deleted@example.org')
+        deleted.delete()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.assertEqual(self._search('deleted'), [])
+
+    def test_search_as_member_finds_members_only(self):
+        create_membership(self.club, 'officer@example.org', Membership.MemberTypes.OFFICER)
+        create_membership(self.club, 'member@example.org')
+        self.membership.member_type = Membership.MemberTypes.MEMBER
+        self.membership.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self.assertEqual(sorted(self._search('last_name')), ['first_name1', 'member'])
+
+    @override_settings(MEMBERS_PER_PAGE = 2)
+    def test_search_in_pages(self):
+        for counter in range(3):
+            create_membership(self.club, f'player{counter}@example.org')
+
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url, {'q' : 'player'})
+        self.assertTrue(response.context['has_next'])
+        self.assertEqual(len(response.context['membership_list']), 2)
+        response = self.client.get(self.url, {'q' : 'player', 'page' : 2})
+        self.assertFalse(response.context['has_next'])
+        self.assertEqual(len(response.context['membership_list']), 1)
+
+    def test_get_member_search_as_applicant_redirects(self):
+        self.membership.member_type = Membership.MemberTypes.APPLICANT
+        self.membership.save()
+        create_membership(self.club, 'owner@example.org', Membership.MemberTypes.CLUB_OWNER)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url, {'q' : 'first'})
+        redirect_url = reverse('club_page', kwargs = {'club_id' : self.club.id})
+        self.assertRedirects(response, redirect_url, status_code = 302, target_status_code = 200)
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from clubs.helpers import join_tournament
+from clubs.models import User, Club, Membership, Tournament, Participant
+from clubs.tests.helpers import LogInTester, create_membership, create_tournament
+
+class ParticipateInTournamentViewTestCase(TestCase, LogInTester):
+    """Tests of the participate in tournament view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = create_membership(self.club, 'owner@example.org', Membership.MemberTypes.CLUB_OWNER)
+        self.member_membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.MEMBER
+        )
+        self.tournament = create_tournament(self.club, self.membership, deadline = timezone.now() + timedelta(days = 1))
+        self.url = reverse('participate_in_tournament', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+        self.joinable_tournaments_url = reverse('joinable_tournaments', kwargs = {'club_id' : self.club.id})
+        self.tournament_page_url = reverse('tournament_page', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+
+    def test_participate_in_tournament_url(self):
+        self.assertEqual(self.url, f'/participate_in_tournament/{self.club.id}/{self.tournament.id}/')
+
+    def test_participate_in_tournament_counts_participant_once(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, self.tournament_page_url, status_code = 302, target_status_code = 200)
+        self.assertTrue(Participant.objects.filter(tournament = self.tournament, member = self.member_membership).exists())
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, 1)
+
+    def test_participate_in_full_tournament_does_not_join(self):
+        for counter in range(2):
+            Participant.objects.create(tournament = self.tournament, member = create_membership(self.club, f'member{counter}@example.org'))
+
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, self.joinable_tournaments_url, status_code = 302, target_status_code = 200)
+        self.assertFalse(Participant.objects.filter(tournament = self.tournament, member = self.member_membership).exists())
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, 2)
+
+    def test_participate_in_tournament_with_last_seat_taken_meanwhile_does_not_join(self):
+        Participant.objects.create(tournament = self.tournament, member = create_membership(self.club, 'member@example.org'))
+        stale_tournament = Tournament.objects.get(id = self.tournament.id)
+        self.assertIsNotNone(join_tournament(self.tournament, create_membership(self.club, 'other@example.org')))
+        self.assertFalse(stale_tournament.is_full())
+        self.assertIsNone(join_tournament(stale_tournament, self.member_membership))
+        self.assertEqual(Participant.objects.filter(tournament = self.tournament).count(), 2)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.participant_count, 2)
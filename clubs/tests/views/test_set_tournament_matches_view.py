@@ -0,0 +1,114 @@
+from django.contrib import messages
+from django.test import TestCase
+from django.urls import reverse
+from clubs.advancement import advance_tournament
+from clubs.forms import SetTournamentMatchesForm
+from clubs.models import User, Club, Membership, Group, Grouping, TournamentMatch
+from clubs.tests.helpers import LogInTester, create_membership, create_tournament
+
+class SetTournamentMatchesViewTestCase(TestCase, LogInTester):
+    """Tests of the set tournament matches view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.CLUB_OWNER
+        )
+        self.tournament = create_tournament(self.club, self.membership, 16)
+        advance_tournament(self.tournament)
+        self.url = reverse('set_tournament_matches', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+        self.tournament_page_url = reverse('tournament_page', kwargs = {'club_id' : self.club.id, 'tournament_id' : self.tournament.id})
+
+    def _form_input(self, conclusion):
+        return {
+            SetTournamentMatchesForm.field_name(tournament_match) : conclusion
+            for tournament_match in TournamentMatch.objects.filter(tournament = self.tournament, conclusion__isnull = True)
+        }
+
+    def test_set_tournament_matches_url(self):
+        self.assertEqual(self.url, f'/set_tournament_matches/{self.club.id}/{self.tournament.id}/')
+
+    def test_get_set_tournament_matches(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'set_tournament_matches.html')
+        self.assertEqual(len(response.context['form'].fields), 4 * 6)
+
+    def test_post_sets_all_matches_and_advances_once(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.post(self.url, self._form_input(TournamentMatch.ConclusionTypes.PLAYER_1_WINS))
+        self.assertRedirects(response, self.tournament_page_url, status_code = 302, target_status_code = 200)
+        self.assertFalse(TournamentMatch.objects.filter(tournament = self.tournament, group__type = Group.Types.GROUP, conclusion__isnull = True).exists())
+        self.assertEqual(sum(Grouping.objects.filter(group__type = Group.Types.GROUP, group__tournament = self.tournament).values_list('points_in_group', flat = True)), 24)
+        self.assertEqual(Group.objects.filter(tournament = self.tournament, is_active = True, type = Group.Types.QUARTER_FINAL).count(), 4)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.phase, 2)
+
+    def test_post_with_some_matches_does_not_advance(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        form_input = self._form_input(TournamentMatch.ConclusionTypes.DRAW)
+        form_input[next(iter(form_input))] = ''
+        self.client.post(self.url, form_input)
+        self.assertEqual(TournamentMatch.objects.filter(tournament = self.tournament, conclusion__isnull = True).count(), 1)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.phase, 1)
+
+    def test_post_with_match_concluded_before_post_sets_nothing_and_reports_it(self):
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        form_input = self._form_input(TournamentMatch.ConclusionTypes.PLAYER_2_WINS)
+        concluded_match = TournamentMatch.objects.filter(tournament = self.tournament).first()
+        TournamentMatch.objects.filter(id = concluded_match.id).update(conclusion = TournamentMatch.ConclusionTypes.DRAW)
+        response = self.client.post(self.url, form_input, follow = True)
+        self.assertRedirects(response, self.url, status_code = 302, target_status_code = 200)
+        messages_list = list(response.context['messages'])
+        self.assertEqual(len(messages_list), 1)
+        self.assertEqual(messages_list[0].level, messages.ERROR)
+        concluded_match.refresh_from_db()
+        self.assertEqual(concluded_match.conclusion, TournamentMatch.ConclusionTypes.DRAW)
+        self.assertEqual(TournamentMatch.objects.filter(tournament = self.tournament, conclusion = TournamentMatch.ConclusionTypes.PLAYER_2_WINS).count(), 0)
+
+    def test_post_with_match_of_other_tournament_leaves_it_open(self):
+        other_tournament = create_tournament(self.club, self.membership, 2, name = 'Other Tournament')
+        advance_tournament(other_tournament)
+        other_match = TournamentMatch.objects.get(tournament = other_tournament)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        form_input = self._form_input(TournamentMatch.ConclusionTypes.PLAYER_2_WINS)
+        form_input[SetTournamentMatchesForm.field_name(other_match)] = TournamentMatch.ConclusionTypes.DRAW
+        self.client.post(self.url, form_input)
+        other_match.refresh_from_db()
+        self.assertIsNone(other_match.conclusion)
+        self.assertEqual(TournamentMatch.objects.filter(tournament = self.tournament, conclusion = TournamentMatch.ConclusionTypes.PLAYER_2_WINS).count(), 24)
+
+    def test_form_with_match_concluded_meanwhile_sets_nothing(self):
+        tournament_matches = list(TournamentMatch.objects.filter(tournament = self.tournament, conclusion__isnull = True))
+        TournamentMatch.objects.filter(id = tournament_matches[0].id).update(conclusion = TournamentMatch.ConclusionTypes.DRAW)
+        form_input = {
+            SetTournamentMatchesForm.field_name(tournament_match) : TournamentMatch.ConclusionTypes.PLAYER_2_WINS
+            for tournament_match in tournament_matches
+        }
+        form = SetTournamentMatchesForm(tournament_matches = tournament_matches, data = form_input)
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(form.save())
+        self.assertEqual(TournamentMatch.objects.filter(tournament = self.tournament, conclusion = TournamentMatch.ConclusionTypes.PLAYER_2_WINS).count(), 0)
+        self.assertEqual(sum(Grouping.objects.filter(group__tournament = self.tournament).values_list('points_in_group', flat = True)), 0)
+
+    def test_get_set_tournament_matches_as_participant_redirects(self):
+        self.tournament.organiser = create_membership(self.club, 'organiser@example.org', Membership.MemberTypes.OFFICER)
+        self.tournament.save()
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, self.tournament_page_url, status_code = 302, target_status_code = 302)
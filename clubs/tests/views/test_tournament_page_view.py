@@ -0,0 +1,97 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs import club_cache
+from clubs.advancement import advance_tournament
+from clubs.models import User, Club, Membership, TournamentMatch
+from clubs.tests.helpers import LogInTester, create_tournament
+
+class TournamentPageViewTestCase(TestCase, LogInTester):
+    """Tests of the tournament page view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.CLUB_OWNER
+        )
+
+    def _create_tournament(self, total_participants):
+        tournament = create_tournament(self.club, self.membership, total_participants)
+        advance_tournament(tournament)
+        return tournament
+
+    def _get_tournament_page(self, tournament):
+        url = reverse('tournament_page', kwargs = {'club_id' : self.club.id, 'tournament_id' : tournament.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        return (response, len(queries))
+
+    def test_get_tournament_page(self):
+        tournament = self._create_tournament(4)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'tournament_page.html')
+
+        for tournament_match in TournamentMatch.objects.filter(tournament = tournament):
+            self.assertContains(response, tournament_match.player1.participant.member.member_full_name())
+            self.assertContains(response, tournament_match.player2.participant.member.member_full_name())
+
+    def test_get_tournament_page_hides_concluded_matches(self):
+        tournament = self._create_tournament(4)
+        concluded_match = TournamentMatch.objects.filter(tournament = tournament).first()
+        TournamentMatch.objects.filter(id = concluded_match.id).update(conclusion = TournamentMatch.ConclusionTypes.DRAW)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertNotContains(response, reverse('set_tournament_match', kwargs = {'club_id' : self.club.id, 'tournament_id' : tournament.id, 'tournament_match_id' : concluded_match.id}))
+
+    def test_get_tournament_page_takes_same_number_of_queries_for_any_group_size(self):
+        small_tournament = self._create_tournament(16)
+        large_tournament = self._create_tournament(96)
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        # Caches navbar memberships, so both pages are counted without it.
+        self.client.get(reverse('user_page'))
+        small_response, small_query_count = self._get_tournament_page(small_tournament)
+        large_response, large_query_count = self._get_tournament_page(large_tournament)
+        self.assertEqual(small_query_count, large_query_count)
+
+    def test_get_tournament_page_does_not_share_rendered_matches_of_organiser_with_participants(self):
+        tournament = self._create_tournament(4)
+        tournament_match = TournamentMatch.objects.filter(tournament = tournament).first()
+        set_match_url = reverse('set_tournament_match', kwargs = {'club_id' : self.club.id, 'tournament_id' : tournament.id, 'tournament_match_id' : tournament_match.id})
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertContains(response, set_match_url)
+        self.client.force_login(tournament_match.player1.participant.member.member)
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertContains(response, tournament_match.player1.participant.member.member_full_name())
+        self.assertNotContains(response, set_match_url)
+
+    def test_get_tournament_page_reuses_rendered_matches_until_club_changes(self):
+        tournament = self._create_tournament(4)
+        tournament_match = TournamentMatch.objects.filter(tournament = tournament).first()
+        member = tournament_match.player1.participant.member
+        self.client.login(email = 'test1@example.org', password = 'Password123')
+        self._get_tournament_page(tournament)
+        Membership.objects.filter(id = member.id).update(member_first_name = 'Renamed')
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertNotContains(response, 'Renamed')
+        club_cache.invalidate_club(self.club.id)
+        response, query_count = self._get_tournament_page(tournament)
+        self.assertContains(response, 'Renamed')
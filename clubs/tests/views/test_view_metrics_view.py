@@ -0,0 +1,40 @@
+from django.test import TestCase
+from django.urls import reverse
+from clubs import metrics
+from clubs.models import User
+from clubs.tests.helpers import LogInTester, reverse_with_next
+
+class ViewMetricsViewTestCase(TestCase, LogInTester):
+    """Tests of the view metrics view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.url = reverse('view_metrics')
+        metrics.registry.reset()
+
+    def test_view_metrics_url(self):
+        self.assertEqual(self.url, '/metrics/')
+
+    def test_get_view_metrics_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse_with_next('log_in', self.url), status_code=302, target_status_code=200)
+
+    def test_get_view_metrics_when_not_staff(self):
+        self.client.login(email = 'test1@example.org', password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_view_metrics_as_staff(self):
+        self.user.is_admin = True
+        self.user.save()
+        self.client.login(email = 'test1@example.org', password='Password123')
+        self.client.get(reverse('user_page'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        content = response.content.decode()
+        self.assertIn('# TYPE view_wall_time_seconds histogram', content)
+        self.assertIn('view_queries_count{view="user_page"} 1', content)
+        self.assertIn('view_queries_bucket{view="user_page",le="+Inf"} 1', content)
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from clubs import helpers
+from clubs.models import User, Club, Membership
+from clubs.tests.helpers import create_tournament
+
+class ViewRequirementsTestCase(TestCase):
+    """Tests of the queries of the view requirement decorators."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+            ]
+
+    def setUp(self):
+        self.user = User.objects.get(email = 'test1@example.org')
+        self.club = Club.objects.get(name = 'Test Club')
+        self.membership = Membership.objects.create(
+            club = self.club,
+            member = self.user,
+            member_first_name = 'first_name1',
+            member_last_name = 'last_name1',
+            member_contact_details = '0712345678',
+            member_personal_statement = 'My personal statement',
+            member_bio =  'my bio',
+            member_chess_experience_level = 0,
+            member_type = Membership.MemberTypes.CLUB_OWNER
+        )
+        self.tournament = create_tournament(self.club, self.membership, deadline = timezone.now() + timedelta(days = 1))
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_view_club_requirements_resolves_club_and_membership_in_one_query(self):
+        def view(request, club_id):
+            return (request.club.name, request.membership.member_type)
+
+        with self.assertNumQueries(1):
+            result = helpers.view_club_requirements(view)(self.request, self.club.id)
+
+        self.assertEqual(result, (self.club.name, Membership.MemberTypes.CLUB_OWNER))
+
+    def test_view_tournament_requirements_resolves_tournament_in_one_more_query(self):
+        def view(request, club_id, tournament_id):
+            return (request.club.name, request.membership.id, request.tournament.name, request.tournament.organiser.id, request.tournament.club.name)
+
+        with self.assertNumQueries(2):
+            result = helpers.view_tournament_requirements(view)(self.request, self.club.id, self.tournament.id)
+
+        self.assertEqual(result, (self.club.name, self.membership.id, 'Test Tournament', self.membership.id, self.club.name))
@@ -1,12 +1,24 @@
-from django.core.exceptions import ObjectDoesNotExist
+import re
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import render, redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.cache import cache_control
 from clubs import helpers
 from clubs import forms
-from clubs.models import User, Club, Membership, Tournament, Co_oped, Group, Participant, Grouping, TournamentMatch
+from clubs import advancement
+from clubs import avatars
+from clubs import club_cache
+from clubs import metrics
+from clubs import search
+from clubs.models import User, Membership, Tournament, Co_oped, Group, Participant, TournamentMatch
 
 @helpers.view_login_prohibited
 def home(request):
@@ -58,8 +70,7 @@ def log_out(request):
 
 @login_required
 def user_page(request):
-    memberships = Membership.objects.filter(member = request.user)
-    return render(request, 'user_page.html', {'memberships' : memberships})
+    return render(request, 'user_page.html')
 
 @login_required
 def create_club(request):
@@ -75,8 +86,7 @@ def create_club(request):
         club_form = forms.ClubCreationForm(prefix = 'club_form')
         ownership_form = forms.MembershipOwnerSignUpForm(prefix = 'ownership_form')
 
-    memberships = Membership.objects.filter(member = request.user)
-    return render(request, 'create_club.html', {'memberships' : memberships, 'club_form' : club_form, 'ownership_form' : ownership_form})
+    return render(request, 'create_club.html', {'club_form' : club_form, 'ownership_form' : ownership_form})
 
 @login_required
 def membership_sign_up(request):
@@ -89,48 +99,76 @@ def membership_sign_up(request):
     else:
         form = forms.MembershipSignUpForm(user = request.user)
 
-    memberships = Membership.objects.filter(member = request.user)
-    return render(request, 'membership_sign_up.html', {'memberships' : memberships, 'form' : form})
+    return render(request, 'membership_sign_up.html', {'form' : form})
 
 @login_required
 @helpers.view_club_requirements
 def club_page(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    memberships = Membership.objects.filter(member = request.user)
-    club_and_owner_membership = Membership.objects.get(club = club, member_type = Membership.MemberTypes.CLUB_OWNER)
-    tournaments = Tournament.objects.filter(participant__won = True, is_active = False)
-    return render(request, 'club_page.html', {'membership' : membership, 'memberships' : memberships, 'club_and_owner_membership' : club_and_owner_membership, 'tournaments' : tournaments})
+    club = request.club
+    membership = request.membership
+    # Read before data, so fragments are never cached under a newer version than their data.
+    fragment_context = club_cache.fragment_context(club.id, membership.member_type)
+    club_and_owner_membership = club_cache.get_or_set_club_entry(club.id, ['club_and_owner_membership'], lambda: helpers.club_and_owner_membership(club))
+    # Pages are cached by number shown, so missing, invalid and out of range page numbers share entries.
+    winner_count = club_cache.get_or_set_club_entry(club.id, ['winner_count'], lambda: helpers.club_winners(club).count())
+    page_number = helpers.club_winners_page_number(winner_count, request.GET.get('page'))
+    winners = club_cache.get_or_set_club_entry(club.id, ['winners', page_number], lambda: helpers.club_winners_page(club, page_number, winner_count))
+    return render(request, 'club_page.html', {
+            'membership' : membership,
+            'club_and_owner_membership' : club_and_owner_membership,
+            'winners' : winners,
+            **fragment_context
+        }
+    )
 
 @login_required
 @helpers.view_club_requirements
 def member_list(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
+    club = request.club
+    membership = request.membership
 
     if (membership.is_applicant() == False):
-        if (membership.is_member()):
-            membership_list = Membership.objects.filter(club = club, member__is_admin = False, member_type = Membership.MemberTypes.MEMBER)
-        else:
-            membership_list = Membership.objects.filter(club = club, member__is_admin = False)
-
-        memberships = Membership.objects.filter(member = request.user)
-        return render(request, 'member_list.html', {'membership' : membership, 'memberships' : memberships, 'membership_list' : membership_list})
+        # Invalid cursors decode to None, so show, and share cached entries with, the first page.
+        after = helpers.decode_cursor(request.GET.get('after'))
+        before = helpers.decode_cursor(request.GET.get('before'))
+        # Members see members only, and officers and owners see everyone.
+        visible = 'members' if membership.is_member() else 'all'
+        fragment_context = club_cache.fragment_context(club.id, visible)
+        membership_list, next_cursor, previous_cursor = club_cache.get_or_set_club_entry(
+            club.id,
+            ['member_list', visible, after, before],
+            lambda: helpers.get_keyset_page(
+                helpers.member_list_memberships(membership),
+                ('member_first_name', 'member_last_name', 'id'),
+                settings.MEMBERS_PER_PAGE,
+                after = after,
+                before = before
+            )
+        )
+        return render(request, 'member_list.html', {
+                'membership' : membership,
+                'membership_list' : membership_list,
+                'next_cursor' : next_cursor,
+                'previous_cursor' : previous_cursor,
+                'after' : after,
+                'before' : before,
+                **fragment_context
+            }
+        )
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_user_and_club_requirements
 def show_member(request, user_id, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    user = User.objects.get(id = user_id)
-    member_membership = Membership.objects.get(club = club, member = user)
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
+    user = member_membership.member
 
     if (membership.is_applicant() == False):
         if (user.is_staff == False):
-            memberships = Membership.objects.filter(member = request.user)
-            return render(request, 'show_member.html', {'membership' : membership, 'memberships' : memberships, 'member_membership': member_membership})
+            return render(request, 'show_member.html', {'membership' : membership, 'member_membership': member_membership})
         else:
             return redirect(reverse('member_list', kwargs = {'club_id' : club_id}))
     else:
@@ -139,10 +177,10 @@ def show_member(request, user_id, club_id):
 @login_required
 @helpers.view_user_and_club_requirements
 def decline_application(request, user_id, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    user = User.objects.get(id = user_id)
-    member_membership = Membership.objects.get(club = club, member = user)
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
+    user = member_membership.member
 
     if (membership.is_applicant() == False):
         if (user.is_staff == False and (member_membership.is_member() or membership.is_member() == False)):
@@ -159,10 +197,10 @@ def decline_application(request, user_id, club_id):
 @login_required
 @helpers.view_user_and_club_requirements
 def set_member(request, user_id, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    user = User.objects.get(id = user_id)
-    member_membership = Membership.objects.get(club = club, member = user)
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
+    user = member_membership.member
 
     if (membership.is_applicant() == False):
         if (user.is_staff == False and (member_membership.is_member() or membership.is_member() == False)):
@@ -182,10 +220,10 @@ def set_member(request, user_id, club_id):
 @login_required
 @helpers.view_user_and_club_requirements
 def set_officer(request, user_id, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    user = User.objects.get(id = user_id)
-    member_membership = Membership.objects.get(club = club, member = user)
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
+    user = member_membership.member
 
     if (membership.is_applicant() == False):
         if (user.is_staff == False and (member_membership.is_member() or membership.is_member() == False)):
@@ -202,10 +240,10 @@ def set_officer(request, user_id, club_id):
 @login_required
 @helpers.view_user_and_club_requirements
 def set_owner(request, user_id, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
-    user = User.objects.get(id = user_id)
-    member_membership = Membership.objects.get(club = club, member = user)
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
+    user = member_membership.member
 
     if (membership.is_applicant() == False):
         if (user.is_staff == False and membership.is_member() == False):
@@ -224,8 +262,8 @@ def set_owner(request, user_id, club_id):
 @login_required
 @helpers.view_club_requirements
 def application_edit(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
+    club = request.club
+    membership = request.membership
 
     if (membership.is_applicant()):
         if request.method == 'POST':
@@ -238,16 +276,15 @@ def application_edit(request, club_id):
         else:
             form = forms.ApplicationEditForm(instance = membership)
 
-        memberships = Membership.objects.filter(member = request.user)
-        return render(request, 'application_edit.html', {'membership' : membership, 'memberships' : memberships, 'form': form})
+        return render(request, 'application_edit.html', {'membership' : membership, 'form': form})
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_club_requirements
 def create_tournament(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
+    club = request.club
+    membership = request.membership
 
     if(membership.is_applicant() == False and membership.is_member() == False):
         if request.method == 'POST':
@@ -260,45 +297,44 @@ def create_tournament(request, club_id):
         else:
             form = forms.TournamentCreationForm()
 
-        memberships = Membership.objects.filter(member = request.user)
-        return render(request, 'create_tournament.html', {'membership' : membership, 'memberships' : memberships, 'form' : form})
+        return render(request, 'create_tournament.html', {'membership' : membership, 'form' : form})
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_club_requirements
 def joinable_tournaments(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
+    club = request.club
+    membership = request.membership
 
     if (membership.is_applicant() == False):
-        memberships = Membership.objects.filter(member = request.user)
-        tournaments = Tournament.objects.filter(club = club, is_active = True)
+        tournaments = Tournament.objects.filter(
+            club = club,
+            is_active = True,
+            deadline__gte = timezone.now(),
+            participant_count__lt = F('total_participants_limit')
+        )
         tournaments = tournaments.exclude(participant__member = membership)
         tournaments = tournaments.exclude(organiser = membership)
         tournaments = tournaments.exclude(co_oped__co_organiser = membership)
-        temp = tournaments
 
-        for tournament in temp:
-            if ((tournament.total_participants_limit <= tournament.total_participants()) or tournament.passed_deadline()):
-                tournaments = tournaments.exclude(id = tournament.id)
-
-        return render(request, 'joinable_tournaments.html', {'membership' : membership, 'memberships' : memberships, 'tournaments' : tournaments})
+        return render(request, 'joinable_tournaments.html', {'membership' : membership, 'tournaments' : tournaments})
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_tournament_requirements
 def participate_in_tournament(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
     if (membership.is_applicant() == False):
-        if helpers.check_membership_in_tournament(membership, tournament) or (tournament.total_participants_limit <= tournament.total_participants()) or tournament.passed_deadline():
+        if helpers.check_membership_in_tournament(membership, tournament) or tournament.passed_deadline():
+            return redirect(reverse('joinable_tournaments', kwargs = {'club_id' : club_id}))
+        elif helpers.join_tournament(tournament, membership) is None:
             return redirect(reverse('joinable_tournaments', kwargs = {'club_id' : club_id}))
         else:
-            Participant.objects.create(tournament = tournament, member = membership)
             return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
@@ -306,76 +342,71 @@ def participate_in_tournament(request, club_id, tournament_id):
 @login_required
 @helpers.view_club_requirements
 def member_tournaments(request, club_id):
-    club = Club.objects.get(id = club_id)
-    membership = Membership.objects.get(club = club, member = request.user)
+    club = request.club
+    membership = request.membership
 
     if (membership.is_applicant() == False):
-        memberships = Membership.objects.filter(member = request.user)
         tournaments = Tournament.objects.filter(club = club, participant__member = membership)
         tournaments = tournaments.union(Tournament.objects.filter(club = club, organiser = membership))
         tournaments = tournaments.union(membership.co_oped_tournamets.filter(club = club))
-        return render(request, 'member_tournaments.html', {'membership' : membership, 'memberships' : memberships, 'tournaments' : tournaments})
+        return render(request, 'member_tournaments.html', {'membership' : membership, 'tournaments' : tournaments})
     else:
         return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_tournament_requirements
 def tournament_page(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
-    memberships = Membership.objects.filter(member = request.user)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
-    if (helpers.check_membership_in_tournament(membership, tournament)):
+    try:
+        participant = Participant.objects.get(tournament = tournament, member = membership)
+    except ObjectDoesNotExist:
+        participant = None
+
+    if (participant or (membership == tournament.organiser) or tournament.co_organisers.filter(id = membership.id).exists()):
         if tournament.is_active:
-            try:
-                participant = Participant.objects.get(tournament = tournament, member = membership)
-            except ObjectDoesNotExist:
-                groups = Group.objects.filter(tournament = tournament, is_active = True)
-                return render(request, 'tournament_page.html', {
-                        'membership' : membership,
-                        'memberships': memberships,
-                        'tournament' : tournament,
-                        'groups' : groups
-                    }
-                )
-            else:
-                groups = Group.objects.filter(tournament = tournament, is_active = True)
-                return render(request, 'tournament_page.html', {
-                        'membership' : membership,
-                        'memberships': memberships,
-                        'tournament' : tournament,
-                        'groups' : groups,
-                        'participant' : participant
-                    }
-                )
+            # Participants see matches, and organisers also buttons setting them.
+            fragment_context = club_cache.fragment_context(club.id, 'participant' if participant else 'organiser')
+            open_tournament_matches = TournamentMatch.objects.filter(conclusion__isnull = True).order_by('id')
+            open_tournament_matches = open_tournament_matches.select_related('player1__participant__member', 'player2__participant__member')
+            groups = Group.objects.filter(tournament = tournament, is_active = True)
+            groups = groups.prefetch_related(Prefetch('tournamentmatch_set', queryset = open_tournament_matches, to_attr = 'open_tournament_matches'))
+            groups = club_cache.get_or_set_club_entry(club.id, ['tournament_groups', tournament.id], lambda: list(groups))
+            return render(request, 'tournament_page.html', {
+                    'membership' : membership,
+                    'tournament' : tournament,
+                    'groups' : groups,
+                    'participant' : participant,
+                    **fragment_context
+                }
+            )
         else:
             try:
-                winner = Participant.objects.get(tournament = tournament, won = True)
+                winner = Participant.objects.select_related('member').get(tournament = tournament, won = True)
             except ObjectDoesNotExist:
-                return render(request, 'ended_tournament_page.html', {'membership' : membership, 'memberships': memberships, 'tournament' : tournament})
+                return render(request, 'ended_tournament_page.html', {'membership' : membership, 'tournament' : tournament})
             else:
-                return render(request, 'ended_tournament_page.html', {'membership' : membership, 'memberships': memberships, 'tournament' : tournament, 'winner' : winner})
+                return render(request, 'ended_tournament_page.html', {'membership' : membership, 'tournament' : tournament, 'winner' : winner})
 
     return redirect(reverse('member_tournaments', kwargs = {'club_id' : club_id}))
 
 @login_required
 @helpers.view_tournament_requirements
 def available_officers_for_tournament(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
     if ((tournament.organiser == membership) and tournament.is_active):
         membership_list = Membership.objects.filter(club = club, member_type = Membership.MemberTypes.OFFICER)
         membership_list = membership_list.exclude(co_oped__tournament = tournament)
         membership_list = membership_list.exclude(created_tournaments__organiser = membership)
         membership_list = membership_list.exclude(participant__tournament = tournament)
-        memberships = Membership.objects.filter(member = request.user)
 
         return render(request, 'available_officers_for_tournament.html', {
                 'membership' : membership,
-                'memberships' : memberships,
                 'tournament' : tournament,
                 'membership_list' : membership_list
             }
@@ -386,10 +417,10 @@ def available_officers_for_tournament(request, club_id, tournament_id):
 @login_required
 @helpers.view_membership_and_tournament_requirements
 def add_co_organiser(request, club_id, membership_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
-    member_membership = Membership.objects.get(id = membership_id)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
 
     if ((tournament.organiser == membership) and tournament.is_active):
         if (helpers.check_membership_in_tournament(member_membership, tournament) == False):
@@ -402,17 +433,15 @@ def add_co_organiser(request, club_id, membership_id, tournament_id):
 @login_required
 @helpers.view_tournament_requirements
 def co_organiser_list(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
     if ((tournament.organiser == membership) and tournament.is_active):
         co_organisers = Co_oped.objects.filter(tournament = tournament)
-        memberships = Membership.objects.filter(member = request.user)
 
         return render(request, 'co_organiser_list.html', {
                 'membership' : membership,
-                'memberships' : memberships,
                 'tournament' : tournament,
                 'co_organisers' : co_organisers
             }
@@ -423,10 +452,10 @@ def co_organiser_list(request, club_id, tournament_id):
 @login_required
 @helpers.view_membership_and_tournament_requirements
 def remove_co_organiser(request, club_id, membership_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
-    member_membership = Membership.objects.get(id = membership_id)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
+    member_membership = request.member_membership
 
     if (tournament.organiser == membership):
         if helpers.check_membership_in_tournament(member_membership, tournament):
@@ -439,9 +468,9 @@ def remove_co_organiser(request, club_id, membership_id, tournament_id):
 @login_required
 @helpers.view_tournament_requirements
 def leave_tournament(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
     if (membership in tournament.co_organisers.all()):
         Co_oped.objects.get(tournament = tournament, co_organiser = membership).delete()
@@ -453,7 +482,7 @@ def leave_tournament(request, club_id, tournament_id):
         pass
     else:
         if (tournament.passed_deadline() == False):
-            Participant.objects.get(tournament = tournament, member = membership).delete()
+            participant.delete()
             return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
 
     return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
@@ -461,105 +490,123 @@ def leave_tournament(request, club_id, tournament_id):
 @login_required
 @helpers.view_tournament_requirements
 def create_matches(request, club_id, tournament_id):
-    tournament = Tournament.objects.get(id = tournament_id)
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
-
-    if (((membership == tournament.organiser) or (membership in tournament.co_organisers.all())) and tournament.is_active and (not TournamentMatch.objects.filter(tournament = tournament, conclusion__isnull = True)) and tournament.passed_deadline()):
-        groups = Group.objects.filter(tournament = tournament, is_active = True)
-
-        for group in groups:
-            groupings = group.grouping_set.all()
-            groupings = groupings.exclude(id = groupings[0].id)
-
-            if (group.total_participants_limit >= 4):
-                groupings = groupings.exclude(id = groupings[0].id)
-
-            for grouping in groupings:
-                participant = grouping.participant
-                participant.eliminated = True
-                participant.save()
-
-            group.is_active = False
-            group.save()
-
-        participants = Participant.objects.filter(tournament = tournament, eliminated = False)
-        counter = 1
-
-        if participants.count() >= 32:
-            while participants.count() > 1:
-                group = Group.objects.create(tournament = tournament, type = Group.Types.GROUP, number = counter, total_participants_limit = 6)
-                participants = helpers.create_groupings_for_group(tournament, group, participants)
-                counter = counter + 1
-        elif participants.count() >= 16:
-            while participants.count() > 1:
-                group = Group.objects.create(tournament = tournament, type = Group.Types.GROUP, number = counter, total_participants_limit = 4)
-                participants = helpers.create_groupings_for_group(tournament, group, participants)
-                counter = counter + 1
-        elif participants.count() >= 8:
-            while participants.count() > 1:
-                group = Group.objects.create(tournament = tournament, type = Group.Types.QUARTER_FINAL, number = counter, total_participants_limit = 2)
-                participants = helpers.create_groupings_for_group(tournament, group, participants)
-                counter = counter + 1
-        elif participants.count() >= 4:
-            while participants.count() > 1:
-                group = Group.objects.create(tournament = tournament, type = Group.Types.SEMI_FINAL, number = counter, total_participants_limit = 2)
-                participants = helpers.create_groupings_for_group(tournament, group, participants)
-                counter = counter + 1
-        elif participants.count() >= 2:
-            while participants.count() > 1:
-                group = Group.objects.create(tournament = tournament, type = Group.Types.FINAL, number = None, total_participants_limit = 2)
-                participants = helpers.create_groupings_for_group(tournament, group, participants)
-
-        groups = Group.objects.filter(tournament = tournament, is_active = True)
-
-        if groups:
-            for group in groups:
-                groupings = group.grouping_set.all()
-                counter1 = 0
-
-                while counter1 < (groupings.count() - 1):
-                    counter2 = counter1 + 1
-
-                    while counter2 < groupings.count():
-                        TournamentMatch.objects.create(tournament = tournament, group = group, player1 = groupings[counter1], player2 = groupings[counter2])
-                        counter2 = counter2 + 1
-
-                    counter1 = counter1 + 1
-        else:
-            try:
-                participant = Participant.objects.get(tournament = tournament, eliminated = False)
-            except ObjectDoesNotExist:
-                pass
-            else:
-                participant.won = True
-                participant.eliminated = True
-                participant.save()
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
-            tournament.is_active = False
-            tournament.save()
+    if ((membership == tournament.organiser) or (membership in tournament.co_organisers.all())):
+        advancement.advance_tournament(tournament)
 
     return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
 
 @login_required
 @helpers.view_tournament_match_and_tournament_requirements
 def set_tournament_match(request, club_id, tournament_id, tournament_match_id):
-    tournament_match = TournamentMatch.objects.get(id = tournament_match_id)
-    tournament = tournament_match.tournament
-    club = tournament.club
-    membership = Membership.objects.get(club = club, member = request.user)
-    memberships = Membership.objects.filter(member = request.user)
+    tournament_match = request.tournament_match
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
 
     if ((membership == tournament.organiser) or (membership in tournament.co_organisers.all())) and tournament.is_active and (tournament_match.concluded() == False):
         if request.method == 'POST':
             form = forms.SetTournamentMatchForm(instance = tournament_match, data = request.POST)
 
             if form.is_valid():
-                form.save()
-                return redirect(reverse('create_matches', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+                if form.save():
+                    # Results are saved by updates, which do not send signals.
+                    club_cache.invalidate_club(club.id)
+                    return redirect(reverse('create_matches', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+
+                messages.add_message(request, messages.ERROR, 'Tournament match has already been set.')
+                return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
         else:
             form = forms.SetTournamentMatchForm(instance = tournament_match)
 
-        return render(request, 'set_tournament_match.html', {'membership' : membership, 'memberships' : memberships, 'tournament' : tournament, 'form' : form, 'tournament_match' : tournament_match})
+        return render(request, 'set_tournament_match.html', {'membership' : membership, 'tournament' : tournament, 'form' : form, 'tournament_match' : tournament_match})
 
     return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+
+@login_required
+@helpers.view_tournament_requirements
+def set_tournament_matches(request, club_id, tournament_id):
+    tournament = request.tournament
+    club = request.club
+    membership = request.membership
+
+    if ((membership == tournament.organiser) or (membership in tournament.co_organisers.all())) and tournament.is_active:
+        tournament_matches = TournamentMatch.objects.filter(tournament = tournament)
+        tournament_matches = tournament_matches.select_related('group', 'player1__participant__member', 'player2__participant__member').order_by('group__number', 'id')
+
+        if request.method == 'POST':
+            # Posted matches are used, open or not, so results of matches concluded since the form was shown are detected when saving.
+            posted_ids = forms.SetTournamentMatchesForm.posted_tournament_match_ids(request.POST)
+            form = forms.SetTournamentMatchesForm(tournament_matches = tournament_matches.filter(id__in = posted_ids), data = request.POST)
+
+            if form.is_valid():
+                if form.save() is None:
+                    messages.add_message(request, messages.ERROR, 'Some tournament matches have already been set.')
+                    return redirect(reverse('set_tournament_matches', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+
+                # Results are saved by updates, which do not send signals.
+                club_cache.invalidate_club(club.id)
+                advancement.advance_tournament(tournament)
+                return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+        else:
+            form = forms.SetTournamentMatchesForm(tournament_matches = tournament_matches.filter(conclusion__isnull = True))
+
+        return render(request, 'set_tournament_matches.html', {'membership' : membership, 'tournament' : tournament, 'form' : form})
+
+    return redirect(reverse('tournament_page', kwargs = {'club_id' : club_id, 'tournament_id' : tournament_id}))
+
+@login_required
+@helpers.view_club_requirements
+def member_search(request, club_id):
+    club = request.club
+    membership = request.membership
+
+    if (membership.is_applicant() == False):
+        query = request.GET.get('q', '')
+
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+
+        membership_list, has_next = search.search_memberships(helpers.member_list_memberships(membership), query, settings.MEMBERS_PER_PAGE, page)
+        return render(request, 'member_search.html', {
+                'membership' : membership,
+                'membership_list' : membership_list,
+                'query' : query,
+                'page' : page,
+                'has_next' : has_next
+            }
+        )
+    else:
+        return redirect(reverse('club_page', kwargs = {'club_id' : club_id}))
+
+@login_required
+@cache_control(private = True, max_age = 60 * 60 * 24 * 365, immutable = True)
+def avatar(request, email_hash, size):
+    if not (re.fullmatch('[0-9a-f]{32}', email_hash) and (size in settings.AVATAR_SIZES)):
+        raise Http404('No such avatar.')
+
+    # Only avatars of users are rendered and cached, so the cache on disk can not be grown with made up hashes.
+    # Checked before conditional requests are answered, so avatars of deleted users are not confirmed either.
+    if not User.objects.filter(email_hash = email_hash).exists():
+        raise Http404('No such avatar.')
+
+    avatar_etag = avatars.avatar_etag(email_hash, size)
+    response = get_conditional_response(request, etag = avatar_etag)
+
+    if response is None:
+        response = FileResponse(open(avatars.get_avatar_path(email_hash, size), 'rb'), content_type = 'image/png')
+
+    response['ETag'] = avatar_etag
+    return response
+
+@login_required
+def view_metrics(request):
+    if not request.user.is_staff:
+        raise PermissionDenied
+
+    return HttpResponse(metrics.registry.export(), content_type = 'text/plain; version=0.0.4; charset=utf-8')
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 import os
 from pathlib import Path
 from django.contrib.messages import constants as message_constants
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,11 +45,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'clubs.middleware.ViewMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'clubs.middleware.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'clubs.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -57,7 +61,8 @@ ROOT_URLCONF = 'system.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django templates, timing rendering for metrics of views.
+        'BACKEND': 'clubs.metrics.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -66,6 +71,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'clubs.context_processors.memberships',
             ],
         },
     },
@@ -84,6 +90,86 @@ DATABASES = {
     }
 }
 
+# Pragmas of SQLite tuned for concurrent requests: readers do not block on the writer
+# in WAL mode, commits only sync the log at checkpoints, reads are memory mapped and
+# cached, and writers wait on each other instead of failing with database locked.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode' : 'wal',
+    'synchronous' : 'normal',
+    'busy_timeout' : 5000,
+    'mmap_size' : 256 * 1024 * 1024,
+    'cache_size' : -64 * 1024,
+    'temp_store' : 'memory',
+}
+
+# Database profile, selected by environment variable DATABASE_PROFILE. Profile
+# sqlite_production applies pragmas above on each connection, and keeps connections
+# open across requests.
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'default')
+
+if DATABASE_PROFILE == 'sqlite_production':
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    DATABASES['default']['CONN_MAX_AGE'] = 600
+else:
+    SQLITE_PRAGMAS = {}
+
+# Aliases of read replicas of default database, which reads of requests are sent to,
+# unless the session of the request wrote within the pin seconds. A replica for local
+# testing, such as a copy of db.sqlite3, or a file:...?mode=ro URI of one, is set by
+# environment variable DATABASE_REPLICA_NAME.
+DATABASE_ROUTERS = ['clubs.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 5
+
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'OPTIONS': {'uri': True},
+        'CONN_MAX_AGE': DATABASES['default'].get('CONN_MAX_AGE', 0),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS = ['replica']
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Cache backend, selected by environment variable CACHE_BACKEND. Versions of clubs
+# and navbar memberships are invalidated through the cache, so every process serving
+# requests must share it. locmem is per process, so only suits a single process, such
+# as runserver and tests. database shares a table of the default database, made by
+# createcachetable, and memcached the memcached server at CACHE_LOCATION. Without
+# CACHE_BACKEND, database is used when gunicorn runs more than one worker.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'database' if WEB_CONCURRENCY > 1 else 'locmem')
+
+if CACHE_BACKEND == 'locmem':
+    if WEB_CONCURRENCY > 1:
+        raise ImproperlyConfigured('CACHE_BACKEND locmem is per process, so can not be used with more than one worker.')
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+elif CACHE_BACKEND == 'database':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+elif CACHE_BACKEND == 'memcached':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', '127.0.0.1:11211'),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f'Unknown CACHE_BACKEND {CACHE_BACKEND}, expected locmem, database or memcached.')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -140,6 +226,36 @@ LOGIN_URL = 'log_in'
 # Url name for redirecting to user page view.
 USER_PAGE_URL = 'user_page'
 
+# Number of ended tournaments with winners shown per page of club page.
+WINNERS_PER_PAGE = 20
+
+# Number of memberships shown per page of member list.
+MEMBERS_PER_PAGE = 50
+
+# Serve avatars generated locally, instead of gravatars from gravatar.com.
+USE_LOCAL_AVATARS = False
+
+# Sizes, in pixels, of locally generated avatars, and directory they are cached in.
+AVATAR_SIZES = [60, 120]
+AVATAR_CACHE_DIR = BASE_DIR / 'avatar_cache'
+
+# Budgets of views, by URL name, of queries, db_time_seconds, template_time_seconds
+# and wall_time_seconds per request. A warning is logged when a budget is exceeded.
+VIEW_BUDGETS = {
+    'club_page' : {'queries' : 20, 'wall_time_seconds' : 0.5},
+    'member_list' : {'queries' : 20, 'wall_time_seconds' : 0.5},
+    'tournament_page' : {'queries' : 20, 'wall_time_seconds' : 0.5},
+}
+
+# Profile one in this many requests, or no requests if 0, and any request of a staff
+# user carrying this header, unless None. Profiles and summaries of their top functions
+# are written into the profiling directory, which keeps the latest profiles only.
+PROFILING_SAMPLE_RATE = 0
+PROFILING_HEADER = 'X-Profile'
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_FILES = 100
+PROFILING_SUMMARY_FUNCTIONS = 30
+
 # Message level tags are set to use bootstrap terms.
 MESSAGE_TAGS = {
     message_constants.DEBUG : 'dark',
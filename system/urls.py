@@ -28,6 +28,7 @@ urlpatterns = [
     path('membership_sign_up/', views.membership_sign_up, name = 'membership_sign_up'),
     path('club/<int:club_id>/', views.club_page, name = 'club_page'),
     path('members/<int:club_id>/', views.member_list, name = 'member_list'),
+    path('member_search/<int:club_id>/', views.member_search, name = 'member_search'),
     path('member/<int:user_id>/<int:club_id>/', views.show_member, name = 'show_member'),
     path('decline_application/<int:user_id>/<int:club_id>/', views.decline_application, name = 'decline_application'),
     path('set_member/<int:user_id>/<int:club_id>/', views.set_member, name = 'set_member'),
@@ -46,4 +47,7 @@ urlpatterns = [
     path('leave_tournament/<int:club_id>/<int:tournament_id>/', views.leave_tournament, name = 'leave_tournament'),
     path('create_matches/<int:club_id>/<int:tournament_id>/', views.create_matches, name = 'create_matches'),
     path('set_tournament_match/<int:club_id>/<int:tournament_id>/<int:tournament_match_id>/', views.set_tournament_match, name = 'set_tournament_match'),
+    path('avatar/<str:email_hash>/<int:size>/', views.avatar, name = 'avatar'),
+    path('metrics/', views.view_metrics, name = 'view_metrics'),
+    path('set_tournament_matches/<int:club_id>/<int:tournament_id>/', views.set_tournament_matches, name = 'set_tournament_matches'),
 ]